@@ -2,50 +2,73 @@
 from __future__ import annotations
 
 import logging
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from threading import Lock
 from time import perf_counter
-
-import requests
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional, TypeVar
+from urllib.parse import urlparse
 
 from .config import ComparisonConfig, CrawlConfig, ExtractionConfig
 from .adapters import HostingProvider, WhoisProvider
+from .utils import normalize_url
 from .core import (
     ComparisonResult,
-    Comparer,
     CrawlResult,
-    Crawler,
-    Extractor,
     HostingRecord,
     SiteArtifacts,
     WhoisRecord,
 )
-from .whois_client import WhoisClient
-from .hosting_client import HostingClient
+
+if TYPE_CHECKING:  # pragma: no cover - type hints only
+    import requests
+
+    from .core import Comparer, Extractor
 
 logger = logging.getLogger(__name__)
 
+_MIN_POOL_SIZE = 64
+# Two crawls, two WHOIS, two hosting lookups, and two extracts per run.
+_PIPELINE_WORKERS = 8
+_LOOKUP_CACHE_SIZE = 256
+_PHASES = ("crawl", "extract", "whois", "hosting")
+
+_RecordT = TypeVar("_RecordT", WhoisRecord, HostingRecord)
+_ArgT = TypeVar("_ArgT")
+_ResultT = TypeVar("_ResultT")
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class AnalysisTimings:
     crawl: dict[str, float] = field(default_factory=dict)
     extract: dict[str, float] = field(default_factory=dict)
     whois: dict[str, float] = field(default_factory=dict)
     hosting: dict[str, float] = field(default_factory=dict)
     compare: float = 0.0
+    total: float = field(init=False, default=0.0)
 
-    @property
-    def total(self) -> float:
-        return (
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "total",
             sum(self.crawl.values())
             + sum(self.extract.values())
             + sum(self.whois.values())
             + sum(self.hosting.values())
-            + self.compare
+            + self.compare,
+        )
+
+    def summary(self) -> str:
+        """Compact single-line rendering used for the end-of-run log entry."""
+        phases = " ".join(
+            f"{phase}=" + "/".join(f"{role}:{value:.2f}" for role, value in getattr(self, phase).items())
+            for phase in _PHASES
         )
+        return f"{phases} compare={self.compare:.2f} total={self.total:.2f}"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     base: SiteArtifacts
     clone: SiteArtifacts
@@ -57,6 +80,41 @@ class AnalysisResult:
     timings: AnalysisTimings
 
 
+class _TimingsCollector:
+    """Thread-safe record of per-phase durations for a single analysis run."""
+
+    def __init__(self) -> None:
+        self._durations: dict[tuple[str, Optional[str]], float] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def phase(self, phase: str, role: Optional[str] = None) -> Iterator[None]:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            with self._lock:
+                self._durations[phase, role] = elapsed
+
+    def timed(self, phase: str, role: str, fn: Callable[[_ArgT], _ResultT], arg: _ArgT) -> _ResultT:
+        with self.phase(phase, role):
+            return fn(arg)
+
+    def build(self) -> AnalysisTimings:
+        with self._lock:
+            durations = dict(self._durations)
+        by_role = {
+            phase: {
+                role: durations[phase, role]
+                for role in ("base", "clone")
+                if (phase, role) in durations
+            }
+            for phase in _PHASES
+        }
+        return AnalysisTimings(**by_role, compare=durations.get(("compare", None), 0.0))
+
+
 class SiteAnalyzer:
     """Coordinates crawl, extraction, comparison, and WHOIS lookups."""
 
@@ -72,125 +130,215 @@ class SiteAnalyzer:
         self.crawl_config = crawl_config
         self.extraction_config = extraction_config
         self.comparison_config = comparison_config
-        self._comparison = Comparer(comparison_config)
-        self._whois: WhoisProvider = whois_provider or WhoisClient()
-        self._hosting: HostingProvider = hosting_provider or HostingClient()
+        # The core engines pull in requests, bs4, and numpy; import them on first
+        # construction so importing this module stays cheap (e.g. for --help).
+        from .core.comparer import Comparer
+        from .core.extractor import Extractor
+
+        self._comparison: "Comparer" = Comparer(comparison_config)
+        # Shared by concurrent base/clone extraction; its image cache lets a clone
+        # that hotlinks the original's assets reuse already-hashed images.
+        self._extractor: "Extractor" = Extractor(config=extraction_config)
+        if whois_provider is None:  # defer client imports until actually needed
+            from .whois_client import WhoisClient
+
+            whois_provider = WhoisClient()
+        if hosting_provider is None:
+            from .hosting_client import HostingClient
+
+            hosting_provider = HostingClient()
+        self._whois: WhoisProvider = whois_provider
+        self._hosting: HostingProvider = hosting_provider
+        self._session: Optional["requests.Session"] = None
+        self._session_lock = Lock()
+        self._whois_cache: dict[str, Future[WhoisRecord]] = {}
+        self._hosting_cache: dict[str, Future[HostingRecord]] = {}
+        self._cache_lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=_PIPELINE_WORKERS,
+            thread_name_prefix="clone-audit",
+        )
+
+    def __enter__(self) -> "SiteAnalyzer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the worker pool and pooled HTTP connections held by the analyzer."""
+        self._executor.shutdown(wait=True)
+        self._extractor.close()
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def _get_session(self) -> "requests.Session":
+        with self._session_lock:
+            if self._session is None:
+                self._session = self._build_session(self.crawl_config)
+            return self._session
+
+    @staticmethod
+    def _build_session(crawl_config: CrawlConfig) -> "requests.Session":
+        # One keep-alive pool shared by the base and clone crawls (and by repeated
+        # runs) so TLS handshakes are not paid again for every site.
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=_MIN_POOL_SIZE,
+            pool_maxsize=max(_MIN_POOL_SIZE, crawl_config.page_concurrency * 4),
+            # Retry transient upstream failures, but hand the final response back
+            # (rather than raising) so the crawler still records its status code.
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.25,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=("GET", "HEAD"),
+                raise_on_status=False,
+                # Crawled sites are untrusted; a hostile Retry-After would otherwise
+                # stall the crawl for as long as the server asks, ignoring timeout.
+                respect_retry_after_header=False,
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def run(self, base_url: str, clone_url: str) -> AnalysisResult:
         logger.info("Starting crawl: base=%s clone=%s", base_url, clone_url)
-        crawl_timings: dict[str, float] = {}
-        extract_timings: dict[str, float] = {}
-        whois_timings: dict[str, float] = {}
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            base_future = executor.submit(self._timed_crawl, base_url)
-            clone_future = executor.submit(self._timed_crawl, clone_url)
-            base_crawl, base_crawl_time = base_future.result()
-            clone_crawl, clone_crawl_time = clone_future.result()
-        crawl_timings["base"] = base_crawl_time
-        crawl_timings["clone"] = clone_crawl_time
+        with self._session_lock:
+            if self._session is not None:
+                # The pool outlives a run, but cookies set by one audit's sites must
+                # not be replayed to them in the next.
+                self._session.cookies.clear()
+        # Shared by base and clone within a run only; entries hold preview bytes.
+        self._extractor.clear_cache()
+        executor = self._executor
+        timings = _TimingsCollector()
+        results: dict[tuple[str, str], Any] = {}
+        pending: dict[Future[Any], tuple[str, str]] = {}
 
-        start = perf_counter()
-        base_artifacts = self._extract(base_crawl)
-        extract_timings["base"] = perf_counter() - start
+        def schedule(phase: str, role: str, fn: Callable[[Any], Any], arg: Any) -> None:
+            pending[executor.submit(timings.timed, phase, role, fn, arg)] = (phase, role)
 
-        start = perf_counter()
-        clone_artifacts = self._extract(clone_crawl)
-        extract_timings["clone"] = perf_counter() - start
+        # Crawls, WHOIS, and hosting only depend on the URL, so all of them start at
+        # once; each extract is scheduled the moment its own crawl lands, and the
+        # comparison runs as soon as both extracts exist, while lookups may still
+        # be in flight.
+        targets = [("base", base_url), ("clone", clone_url)]
+        if _site_key(base_url) == _site_key(clone_url):
+            logger.debug("Base and clone URLs resolve to the same site; analysing it once")
+            targets = targets[:1]
+        roles = [role for role, _ in targets]
+        for role, url in targets:
+            schedule("crawl", role, self._crawl_site, url)
+            schedule("whois", role, self._lookup_whois, url)
+            schedule("hosting", role, self._lookup_hosting, url)
 
-        start = perf_counter()
-        comparison = self._comparison.compare(base_artifacts, clone_artifacts)
-        compare_time = perf_counter() - start
-
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            base_future = executor.submit(self._timed_lookup, base_url)
-            clone_future = executor.submit(self._timed_lookup, clone_url)
-            base_whois, base_whois_time = base_future.result()
-            clone_whois, clone_whois_time = clone_future.result()
-        whois_timings["base"] = base_whois_time
-        whois_timings["clone"] = clone_whois_time
-
-        hosting_timings: dict[str, float] = {}
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            base_future = executor.submit(self._timed_host_lookup, base_url)
-            clone_future = executor.submit(self._timed_host_lookup, clone_url)
-            base_hosting, base_host_time = base_future.result()
-            clone_hosting, clone_host_time = clone_future.result()
-        hosting_timings["base"] = base_host_time
-        hosting_timings["clone"] = clone_host_time
-
-        timings = AnalysisTimings(
-            crawl=crawl_timings,
-            extract=extract_timings,
-            whois=whois_timings,
-            hosting=hosting_timings,
-            compare=compare_time,
-        )
-        logger.info(
-            "Analysis timings (s): crawl=%s extract=%s whois=%s compare=%.2f total=%.2f",
-            crawl_timings,
-            extract_timings,
-            whois_timings,
-            compare_time,
-            timings.total,
-        )
+        comparison: Optional[ComparisonResult] = None
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    phase, role = pending.pop(future)
+                    results[phase, role] = future.result()
+                    if phase == "crawl":
+                        schedule("extract", role, self._extract, results[phase, role])
+                if comparison is None and all(("extract", role) in results for role in roles):
+                    with timings.phase("compare"):
+                        comparison = self._comparison.compare(
+                            results["extract", "base"], results["extract", roles[-1]]
+                        )
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        if len(roles) == 1:
+            for phase in _PHASES:
+                results[phase, "clone"] = results[phase, "base"]
+
+        analysis_timings = timings.build()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Analysis timings (s): %s", analysis_timings.summary())
 
         return AnalysisResult(
-            base=base_artifacts,
-            clone=clone_artifacts,
+            base=results["extract", "base"],
+            clone=results["extract", "clone"],
             comparison=comparison,
-            base_whois=base_whois,
-            clone_whois=clone_whois,
-            base_hosting=base_hosting,
-            clone_hosting=clone_hosting,
-            timings=timings,
+            base_whois=results["whois", "base"],
+            clone_whois=results["whois", "clone"],
+            base_hosting=results["hosting", "base"],
+            clone_hosting=results["hosting", "clone"],
+            timings=analysis_timings,
         )
 
-    def _timed_crawl(self, url: str) -> tuple[CrawlResult, float]:
-        start = perf_counter()
-        crawl = self._crawl_site(url)
-        return crawl, perf_counter() - start
-
-    def _timed_lookup(self, url: str) -> tuple[WhoisRecord, float]:
-        start = perf_counter()
-        record = self._lookup_whois(url)
-        return record, perf_counter() - start
+    def _crawl_site(self, url: str) -> CrawlResult:
+        return self._crawl(url, self._get_session())
 
-    def _timed_host_lookup(self, url: str) -> tuple[HostingRecord, float]:
-        start = perf_counter()
-        record = self._lookup_hosting(url)
-        return record, perf_counter() - start
+    def _crawl(self, url: str, session: "requests.Session") -> CrawlResult:
+        from .core.crawler import Crawler
 
-    def _crawl_site(self, url: str) -> CrawlResult:
-        session = requests.Session()
-        try:
-            return self._crawl(url, session)
-        finally:
-            session.close()
-
-    def _crawl(self, url: str, session: requests.Session) -> CrawlResult:
-        config = CrawlConfig(
-            base_url=url,
-            max_pages=self.crawl_config.max_pages,
-            max_depth=self.crawl_config.max_depth,
-            delay_seconds=self.crawl_config.delay_seconds,
-            timeout=self.crawl_config.timeout,
-            same_domain_only=self.crawl_config.same_domain_only,
-            user_agent=self.crawl_config.user_agent,
-            page_concurrency=self.crawl_config.page_concurrency,
-        )
+        config = replace(self.crawl_config, base_url=url)
         crawler = Crawler(config=config, session=session)
         return crawler.crawl()
 
     def _extract(self, crawl_result: CrawlResult) -> SiteArtifacts:
-        extractor = Extractor(config=self.extraction_config)
-        return extractor.extract(crawl_result)
+        return self._extractor.extract(crawl_result)
 
     def _lookup_whois(self, target: str) -> WhoisRecord:
-        return self._whois.lookup(target)
+        return self._memoized_lookup(self._whois_cache, target, self._whois.lookup)
 
     def _lookup_hosting(self, target: str) -> HostingRecord:
-        return self._hosting.lookup(target)
+        return self._memoized_lookup(self._hosting_cache, target, self._hosting.lookup)
+
+    def _memoized_lookup(
+        self,
+        cache: dict[str, Future[_RecordT]],
+        target: str,
+        lookup: Callable[[str], _RecordT],
+    ) -> _RecordT:
+        """Resolve ``target`` once per host, sharing in-flight lookups between threads."""
+        key = _lookup_key(target)
+        with self._cache_lock:
+            future = cache.get(key)
+            owner = future is None
+            if owner:
+                future = cache[key] = Future()
+                if len(cache) > _LOOKUP_CACHE_SIZE:
+                    cache.pop(next(iter(cache)))
+        if not owner:
+            return future.result()
+        try:
+            record = lookup(target)
+        except BaseException as exc:
+            self._evict(cache, key, future)
+            future.set_exception(exc)
+            raise
+        if record.error:
+            # Failed lookups are shared with concurrent callers but retried next run.
+            self._evict(cache, key, future)
+        future.set_result(record)
+        return record
+
+    def _evict(self, cache: dict[str, Future[_RecordT]], key: str, future: Future[_RecordT]) -> None:
+        with self._cache_lock:
+            if cache.get(key) is future:
+                del cache[key]
+
+
+def _site_key(url: str) -> str:
+    return normalize_url(url).rstrip("/")
+
+
+def _lookup_key(target: str) -> str:
+    parsed = urlparse(target)
+    host = parsed.netloc.split(":")[0] if parsed.scheme and parsed.netloc else target
+    return host.lower()
 
 
 __all__ = ["SiteAnalyzer", "AnalysisResult", "AnalysisTimings"]
@@ -2,8 +2,8 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
+from functools import cache
 from pathlib import Path
 
 if __package__ is None or __package__ == "":  # pragma: no cover - script execution path
@@ -50,6 +50,23 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="Number of parallel fetchers per site (1 disables parallel crawl)",
     )
+    parser.add_argument(
+        "--image-concurrency",
+        type=int,
+        default=8,
+        help="Number of parallel image downloads, shared by both sites (1 fetches images one at a time)",
+    )
+    parser.add_argument(
+        "--image-cache",
+        type=Path,
+        help="SQLite file for caching image hashes between runs (disabled if omitted)",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=["html.parser", "lxml"],
+        default="html.parser",
+        help="BeautifulSoup parser for artefact extraction (lxml is faster but changes locators and structure scores)",
+    )
     parser.add_argument(
         "--user-agent",
         default=DEFAULT_CRAWLER_USER_AGENT,
@@ -71,6 +88,7 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--json-output", type=Path, help="Optional path for JSON report payload")
     parser.add_argument("--pdf-output", type=Path, help="Optional path for PDF report with image previews")
     parser.add_argument("--include-raw", action="store_true", help="Include raw text and WHOIS payloads in reports")
+    parser.add_argument("--skip-empty-sections", action="store_true", help="Omit text/image/structure sections that have no matches")
     parser.add_argument("--no-homepage", action="store_true", help="Skip homepage screenshot comparison in PDF output")
     parser.add_argument("--homepage-threshold", type=float, default=0.7, help="Minimum overall/structural similarity required before capturing homepage screenshots")
     parser.add_argument("--homepage-timeout", type=float, default=20.0, help="Timeout (seconds) for homepage screenshot capture via wkhtmltoimage")
@@ -83,8 +101,14 @@ def build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+@cache
+def _cached_parser() -> argparse.ArgumentParser:
+    # parse_args does not mutate the parser, so repeated main() calls share one.
+    return build_parser()
+
+
 def main(argv: list[str] | None = None) -> int:
-    parser = build_parser()
+    parser = _cached_parser()
     args = parser.parse_args(argv)
     configure_logging(args.log_level)
 
@@ -102,6 +126,9 @@ def main(argv: list[str] | None = None) -> int:
         collect_images=not args.no_images,
         collect_text=not args.no_text,
         collect_structure=not args.no_structure,
+        image_concurrency=max(1, args.image_concurrency),
+        image_cache_path=str(args.image_cache) if args.image_cache else None,
+        html_parser=args.html_parser,
     )
     comparison_config = ComparisonConfig(
         text_threshold=args.text_threshold,
@@ -118,6 +145,7 @@ def main(argv: list[str] | None = None) -> int:
         json_output_path=str(args.json_output) if args.json_output else None,
         pdf_output_path=str(args.pdf_output) if args.pdf_output else None,
         include_raw_data=args.include_raw,
+        skip_empty_sections=args.skip_empty_sections,
         include_homepage=not args.no_homepage,
         homepage_similarity_threshold=args.homepage_threshold,
         homepage_capture_timeout=args.homepage_timeout,
@@ -128,38 +156,36 @@ def main(argv: list[str] | None = None) -> int:
         homepage_user_agent=args.homepage_user_agent,
     )
 
-    analyzer = SiteAnalyzer(
+    with SiteAnalyzer(
         crawl_config=crawl_config,
         extraction_config=extraction_config,
         comparison_config=comparison_config,
-    )
-
-    logger.info("Running analysis")
-    analysis = analyzer.run(args.base, args.clone)
-
-    builder = ReportBuilder(report_config)
-    markdown = builder.build_markdown(analysis)
-    if args.output:
-        _ensure_parent(args.output)
-        args.output.write_text(markdown, encoding="utf-8")
-        logger.info("Markdown report written to %s", args.output)
-    else:
-        print(markdown)
-
-    if args.json_output:
-        _ensure_parent(args.json_output)
-        payload = builder.build_json(analysis)
-        args.json_output.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        logger.info("JSON report written to %s", args.json_output)
-
-    if args.pdf_output:
-        _ensure_parent(args.pdf_output)
-        try:
-            builder.build_pdf(analysis, str(args.pdf_output))
-        except RuntimeError as exc:
-            logger.error("Failed to generate PDF report: %s", exc)
+    ) as analyzer:
+        logger.info("Running analysis")
+        analysis = analyzer.run(args.base, args.clone)
+
+    with ReportBuilder(report_config) as builder:
+        markdown = builder.build_markdown(analysis)
+        if args.output:
+            _ensure_parent(args.output)
+            args.output.write_text(markdown, encoding="utf-8")
+            logger.info("Markdown report written to %s", args.output)
         else:
-            logger.info("PDF report written to %s", args.pdf_output)
+            print(markdown)
+
+        if args.json_output:
+            _ensure_parent(args.json_output)
+            args.json_output.write_bytes(builder.build_json_bytes(analysis))
+            logger.info("JSON report written to %s", args.json_output)
+
+        if args.pdf_output:
+            _ensure_parent(args.pdf_output)
+            try:
+                builder.build_pdf(analysis, str(args.pdf_output))
+            except RuntimeError as exc:
+                logger.error("Failed to generate PDF report: %s", exc)
+            else:
+                logger.info("PDF report written to %s", args.pdf_output)
 
     return 0
 
@@ -1,7 +1,7 @@
 """Configuration dataclasses for the clone auditor."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 
@@ -11,7 +11,7 @@ DEFAULT_CRAWLER_USER_AGENT = (
 )
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class CrawlConfig:
     base_url: str
     max_pages: int = 50
@@ -23,16 +23,22 @@ class CrawlConfig:
     page_concurrency: int = 1
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ExtractionConfig:
     collect_images: bool = True
     collect_text: bool = True
     collect_structure: bool = True
     min_text_length: int = 40
     max_text_length: int = 2000
+    image_concurrency: int = 8
+    image_cache_path: Optional[str] = None  # SQLite file reused across runs
+    # "lxml" is faster but repairs markup differently (and adds html/body wrappers),
+    # which changes locators and structure scores; it is opt-in so reports stay
+    # comparable across installs and match the crawler's html.parser view.
+    html_parser: str = "html.parser"
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ComparisonConfig:
     text_threshold: float = 0.75
     high_confidence_threshold: float = 0.95
@@ -42,16 +48,22 @@ class ComparisonConfig:
     weight_images: float = 0.4
     weight_structure: float = 0.2
     top_match_limit: int = 10
+    _normalised: tuple[float, float, float] = field(init=False, repr=False, compare=False)
 
-    def normalised_weights(self) -> tuple[float, float, float]:
+    def __post_init__(self) -> None:
         total = self.weight_text + self.weight_images + self.weight_structure
         if total == 0:
-            return (0.0, 0.0, 0.0)
-        return (
-            self.weight_text / total,
-            self.weight_images / total,
-            self.weight_structure / total,
-        )
+            normalised = (0.0, 0.0, 0.0)
+        else:
+            normalised = (
+                self.weight_text / total,
+                self.weight_images / total,
+                self.weight_structure / total,
+            )
+        object.__setattr__(self, "_normalised", normalised)
+
+    def normalised_weights(self) -> tuple[float, float, float]:
+        return self._normalised
 
 
 @dataclass(slots=True)
@@ -61,6 +73,7 @@ class ReportConfig:
     pdf_output_path: Optional[str] = None
     include_raw_data: bool = False
     include_errors: bool = True
+    skip_empty_sections: bool = False  # omit match sections that found nothing
     include_homepage: bool = True
     homepage_similarity_threshold: float = 0.7
     homepage_capture_timeout: float = 20.0
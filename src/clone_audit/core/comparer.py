@@ -1,12 +1,19 @@
 """Comparison logic for extracted artefacts."""
 from __future__ import annotations
 
-import difflib
+import heapq
 import logging
 from collections import defaultdict
 from time import perf_counter
 from typing import Iterable, Optional
 
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    from cydifflib import SequenceMatcher  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    from difflib import SequenceMatcher
+
 from ..config import ComparisonConfig
 from .models import (
     ComparisonResult,
@@ -19,13 +26,32 @@ from .models import (
     TextMatch,
 )
 from .scoring import ScoreAggregator
-from ..utils import canonical_path, hamming_distance, tokenize_text
+from ..utils import cached_tokens, canonical_path
 
 _HASH_BITS = 64
+# Minimum share of distinct tokens two text blocks need before they are scored.
+_MIN_TOKEN_OVERLAP = 0.3
+# SequenceMatcher starts treating frequent characters as junk from this length of b.
+_AUTOJUNK_MIN_CHARS = 200
+_HASH_BYTES = _HASH_BITS // 8
+# Below this many base x clone pairs, int.bit_count() beats building a NumPy distance matrix.
+_VECTORIZE_MIN_PAIRS = 1_024
+_MATRIX_BLOCK_CELLS = 1 << 20
 
 logger = logging.getLogger(__name__)
 
 
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Count set bits per element of a ``uint64`` array."""
+    if hasattr(np, "bitwise_count"):  # NumPy >= 2.0 uses the hardware popcount
+        return np.bitwise_count(values).astype(np.int64)
+    # SWAR fallback: sum bit pairs, nibbles and bytes, then gather the byte sums.
+    values = values - ((values >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    values = (values & np.uint64(0x3333333333333333)) + ((values >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    values = (values + (values >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((values * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
 class Comparer:
     """Computes similarity scores between two sites."""
 
@@ -72,97 +98,78 @@ class Comparer:
         if not prepared_base or not prepared_clone:
             return 0.0, []
 
-        clone_exact: dict[str, list[tuple[TextArtifact, tuple[str, ...], set[str]]]] = defaultdict(list)
-        clone_by_len: dict[int, list[tuple[TextArtifact, tuple[str, ...], set[str]]]] = defaultdict(list)
-        for clone_artifact, clone_tokens, clone_set in prepared_clone:
-            clone_exact[clone_artifact.text].append((clone_artifact, clone_tokens, clone_set))
-            clone_by_len[len(clone_tokens)].append((clone_artifact, clone_tokens, clone_set))
+        index = _TextIndex(
+            [(artifact.text, length, token_set) for artifact, length, token_set in prepared_clone],
+            self.config.text_threshold,
+        )
+        best_matches = [
+            index.best_match(artifact.text, length, token_set) for artifact, length, token_set in prepared_base
+        ]
+
+        def _text_match_weight(match: TextMatch) -> tuple[float, int]:
+            return (
+                match.similarity,
+                min(match.base.token_count, match.clone.token_count),
+            )
 
+        # The report leads with the best match from each base page, then fills any
+        # remaining slots from the rest. Each page's leader (first of its best
+        # weight) is tracked while matches are built, and each tier is selected
+        # with a bounded heap instead of sorting every match.
         matches: list[TextMatch] = []
+        page_best: dict[str, tuple[tuple[float, int], int]] = {}
         seen_pairs: set[tuple[str, str]] = set()
         total = 0.0
-
-        for base_artifact, base_tokens, base_set in prepared_base:
-            best_clone: Optional[TextArtifact] = None
-            best_score = 0.0
-
-            exact_candidates = clone_exact.get(base_artifact.text)
-            if exact_candidates:
-                best_clone = exact_candidates[0][0]
-                best_score = 1.0
-            else:
-                length = len(base_tokens)
-                length_window = max(3, int(length * 0.25))
-                min_len = max(1, length - length_window)
-                max_len = length + length_window
-                for candidate_len in range(min_len, max_len + 1):
-                    candidates = clone_by_len.get(candidate_len)
-                    if not candidates:
-                        continue
-                    for clone_artifact, clone_tokens, clone_set in candidates:
-                        shared = len(base_set & clone_set)
-                        if not shared:
-                            continue
-                        overlap = shared / max(len(base_set), len(clone_set))
-                        if overlap < 0.3:
-                            continue
-                        matcher = difflib.SequenceMatcher(None, base_artifact.text, clone_artifact.text)
-                        if matcher.quick_ratio() < self.config.text_threshold * 0.8:
-                            continue
-                        score = matcher.ratio()
-                        if score > best_score:
-                            best_score = score
-                            best_clone = clone_artifact
-                    if best_score >= 0.999:
-                        break
+        for (base_artifact, _length, _token_set), (best_index, best_score) in zip(prepared_base, best_matches):
             total += best_score
-            if best_clone and best_score >= self.config.text_threshold:
-                pair_key = (
-                    base_artifact.snippet(160),
-                    best_clone.snippet(160),
-                )
-                if pair_key in seen_pairs:
-                    continue
-                seen_pairs.add(pair_key)
-                matches.append(
-                    TextMatch(
-                        base=base_artifact,
-                        clone=best_clone,
-                        similarity=best_score,
-                        high_confidence=best_score >= self.config.high_confidence_threshold,
-                    )
-                )
-        matches.sort(
-            key=lambda match: (
-                match.similarity,
-                min(match.base.token_count, match.clone.token_count),
-            ),
-            reverse=True,
+            if best_index is None or best_score < self.config.text_threshold:
+                continue
+            best_clone = prepared_clone[best_index][0]
+            pair_key = (
+                base_artifact.snippet(160),
+                best_clone.snippet(160),
+            )
+            if pair_key in seen_pairs:
+                continue
+            seen_pairs.add(pair_key)
+            match = TextMatch(
+                base=base_artifact,
+                clone=best_clone,
+                similarity=best_score,
+                high_confidence=best_score >= self.config.high_confidence_threshold,
+            )
+            weight = _text_match_weight(match)
+            leader = page_best.get(base_artifact.page_url)
+            if leader is None or weight > leader[0]:
+                page_best[base_artifact.page_url] = (weight, len(matches))
+            matches.append(match)
+
+        limit = self.config.top_match_limit
+        primary_positions = sorted(position for _weight, position in page_best.values())
+        limited_matches = heapq.nlargest(
+            limit, (matches[position] for position in primary_positions), key=_text_match_weight
         )
-        curated: list[TextMatch] = []
-        overflow: list[TextMatch] = []
-        seen_pages: set[str] = set()
-        for match in matches:
-            if match.base.page_url not in seen_pages:
-                curated.append(match)
-                seen_pages.add(match.base.page_url)
-            else:
-                overflow.append(match)
-        curated.extend(overflow)
-        limited_matches = curated[: self.config.top_match_limit]
+        if len(limited_matches) < limit and len(primary_positions) < len(matches):
+            primary = set(primary_positions)
+            overflow = (match for position, match in enumerate(matches) if position not in primary)
+            limited_matches.extend(heapq.nlargest(limit - len(limited_matches), overflow, key=_text_match_weight))
         average = total / len(prepared_base)
         return average, limited_matches
 
     def _prepare_text_entries(
         self, entries: Iterable[TextArtifact]
-    ) -> list[tuple[TextArtifact, tuple[str, ...], set[str]]]:
-        prepared: list[tuple[TextArtifact, tuple[str, ...], set[str]]] = []
+    ) -> list[tuple[TextArtifact, int, frozenset[str]]]:
+        prepared: list[tuple[TextArtifact, int, frozenset[str]]] = []
         for entry in entries:
-            tokens = entry.tokens if entry.tokens else tuple(tokenize_text(entry.text))
+            if entry.token_set:
+                # Extracted artefacts carry their token set and count; only
+                # hand-built ones need tokenising here.
+                prepared.append((entry, entry.token_count, entry.token_set))
+                continue
+            tokens = entry.tokens or cached_tokens(entry.text)
             if not tokens:
                 continue
-            token_set = set(tokens)
-            prepared.append((entry, tokens, token_set))
+            prepared.append((entry, len(tokens), frozenset(tokens)))
         return prepared
 
     def _compare_images(
@@ -172,28 +179,20 @@ class Comparer:
         clone_list = [img for img in clone_images if img.hash_bits]
         if not base_list or not clone_list:
             return 0.0, []
+        clone_list, clone_hashes = self._parse_hashes(clone_list)
+        if not clone_list:
+            return 0.0, []
+        scored_bases, base_hashes = self._parse_hashes(base_list)
+        clone_sizes = [img.bytes_size or 0 for img in clone_list]
+        if len(base_hashes) * len(clone_hashes) >= _VECTORIZE_MIN_PAIRS:
+            nearest = self._nearest_matrix(base_hashes, clone_hashes, clone_sizes)
+        else:
+            nearest = self._nearest_scalar(base_hashes, clone_hashes, clone_sizes)
         matches: list[ImageMatch] = []
         seen_pairs: set[tuple[str, str]] = set()
         total = 0.0
-        for base_image in base_list:
-            best: Optional[ImageArtifact] = None
-            best_distance = _HASH_BITS
-            for clone_image in clone_list:
-                try:
-                    distance = hamming_distance(base_image.hash_bits, clone_image.hash_bits)
-                except ValueError:
-                    continue
-                if (
-                    distance < best_distance
-                    or (
-                        distance == best_distance
-                        and (clone_image.bytes_size or 0) > (best.bytes_size or 0 if best else -1)
-                    )
-                ):
-                    best_distance = distance
-                    best = clone_image
-            if best is None:
-                continue
+        for base_image, (best_index, best_distance) in zip(scored_bases, nearest):
+            best = clone_list[best_index]
             similarity = 1.0 - (best_distance / _HASH_BITS)
             total += similarity
             if best_distance <= self.config.image_hash_threshold:
@@ -217,11 +216,72 @@ class Comparer:
                 max(match.base.bytes_size or 0, match.clone.bytes_size or 0),
             )
 
-        matches.sort(key=_image_match_weight, reverse=True)
-        limited_matches = matches[: self.config.top_match_limit]
+        limited_matches = heapq.nlargest(self.config.top_match_limit, matches, key=_image_match_weight)
         average = total / len(base_list)
         return average, limited_matches
 
+    # Both nearest-hash strategies return one (clone index, distance) per base hash;
+    # ties go to the largest clone asset, and the first occurrence wins among equal sizes.
+
+    @staticmethod
+    def _nearest_scalar(
+        base_hashes: list[int], clone_hashes: list[int], clone_sizes: list[int]
+    ) -> list[tuple[int, int]]:
+        candidates = list(enumerate(zip(clone_hashes, clone_sizes)))
+        nearest: list[tuple[int, int]] = []
+        for base_hash in base_hashes:
+            best_index = 0
+            best_distance = _HASH_BITS + 1
+            best_size = -1
+            for index, (clone_hash, size) in candidates:
+                distance = (base_hash ^ clone_hash).bit_count()
+                if distance < best_distance or (distance == best_distance and size > best_size):
+                    best_index, best_distance, best_size = index, distance, size
+            nearest.append((best_index, best_distance))
+        return nearest
+
+    @staticmethod
+    def _nearest_matrix(
+        base_hashes: list[int], clone_hashes: list[int], clone_sizes: list[int]
+    ) -> list[tuple[int, int]]:
+        bases = np.array(base_hashes, dtype=np.uint64)
+        clones = np.array(clone_hashes, dtype=np.uint64)
+        sizes = np.asarray(clone_sizes, dtype=np.int64)
+        # Block over base rows so the XOR matrix stays around _MATRIX_BLOCK_CELLS words.
+        step = max(1, _MATRIX_BLOCK_CELLS // len(clones))
+        nearest: list[tuple[int, int]] = []
+        for start in range(0, len(bases), step):
+            block = bases[start : start + step, None] ^ clones[None, :]
+            distances = _popcount64(block)
+            best = distances.min(axis=1, keepdims=True)
+            tied_sizes = np.where(distances == best, sizes, -1)
+            indices = tied_sizes.argmax(axis=1)
+            nearest.extend(zip(indices.tolist(), best[:, 0].tolist()))
+        return nearest
+
+    @classmethod
+    def _parse_hashes(cls, images: list[ImageArtifact]) -> tuple[list[ImageArtifact], list[int]]:
+        """Return the images with usable hashes alongside those hashes as ints."""
+        kept: list[ImageArtifact] = []
+        values: list[int] = []
+        for image in images:
+            value = cls._hash_int(image.hash_bits)
+            if value is None:
+                continue
+            kept.append(image)
+            values.append(value)
+        return kept, values
+
+    @staticmethod
+    def _hash_int(hash_bits: Optional[str]) -> Optional[int]:
+        try:
+            raw = bytes.fromhex(hash_bits or "")
+        except ValueError:
+            return None
+        if len(raw) != _HASH_BYTES:
+            return None
+        return int.from_bytes(raw, "big")
+
     def _compare_structure(
         self,
         base_structures,
@@ -235,7 +295,11 @@ class Comparer:
             clone_sig = clone_map.get(path)
             if not clone_sig:
                 continue
-            similarity = self._jaccard_similarity(base_sig.tag_sequence, clone_sig.tag_sequence)
+            # Extracted signatures carry their tag set; hand-built ones get one here.
+            similarity = self._jaccard_similarity(
+                base_sig.tag_set or frozenset(base_sig.tag_sequence),
+                clone_sig.tag_set or frozenset(clone_sig.tag_sequence),
+            )
             scores.append(similarity)
             if similarity >= self.config.structure_threshold:
                 matches.append(
@@ -245,15 +309,14 @@ class Comparer:
                         similarity=similarity,
                     )
                 )
-        matches.sort(key=lambda match: match.similarity, reverse=True)
-        limited_matches = matches[: self.config.top_match_limit]
+        limited_matches = heapq.nlargest(
+            self.config.top_match_limit, matches, key=lambda match: match.similarity
+        )
         average = sum(scores) / len(scores) if scores else 0.0
         return average, limited_matches
 
     @staticmethod
-    def _jaccard_similarity(seq_a, seq_b) -> float:
-        set_a = set(seq_a)
-        set_b = set(seq_b)
+    def _jaccard_similarity(set_a: frozenset[str], set_b: frozenset[str]) -> float:
         if not set_a or not set_b:
             return 0.0
         intersection = len(set_a & set_b)
@@ -261,4 +324,112 @@ class Comparer:
         return intersection / union if union else 0.0
 
 
+_TextKey = tuple[str, int, frozenset[str]]
+
+
+class _TextIndex:
+    """Clone-side lookup structures for finding each base text's best match."""
+
+    def __init__(self, clones: list[_TextKey], text_threshold: float) -> None:
+        self.clones = clones
+        self.quick_floor = text_threshold * 0.8
+        self.exact: dict[str, int] = {}
+        for position, (text, _length, _token_set) in enumerate(clones):
+            self.exact.setdefault(text, position)
+        self.rank, self.prefix_index = self._build_prefix_index(clones)
+        # SequenceMatcher indexes its second sequence; keeping one matcher per clone
+        # text means that index is built once rather than once per candidate pair.
+        self.matchers: dict[str, SequenceMatcher] = {}
+
+    def best_match(
+        self, text: str, length: int, token_set: frozenset[str]
+    ) -> tuple[Optional[int], float]:
+        exact = self.exact.get(text)
+        if exact is not None:
+            return exact, 1.0
+        best_index: Optional[int] = None
+        best_score = 0.0
+        length_window = max(3, int(length * 0.25))
+        min_len = max(1, length - length_window)
+        max_len = length + length_window
+        candidate_ids: set[int] = set()
+        for token in self._token_prefix(token_set, self.rank):
+            candidate_ids.update(self.prefix_index.get(token, ()))
+        candidates = [
+            (self.clones[index][1], index)
+            for index in candidate_ids
+            if min_len <= self.clones[index][1] <= max_len
+        ]
+        # Visit candidates in the same length-bucket order as a plain window scan.
+        candidates.sort()
+        base_chars = len(text)
+        current_len = None
+        for candidate_len, index in candidates:
+            if candidate_len != current_len:
+                if best_score >= 0.999:
+                    break
+                current_len = candidate_len
+            clone_text, _clone_length, clone_set = self.clones[index]
+            # 2*min/(la+lb) bounds quick_ratio() and ratio() from above (difflib's
+            # real_quick_ratio), so pairs failing it can neither pass the floor
+            # nor beat the current best.
+            clone_chars = len(clone_text)
+            length_bound = 2.0 * min(base_chars, clone_chars) / (base_chars + clone_chars)
+            if length_bound < self.quick_floor or length_bound <= best_score:
+                continue
+            shared = len(token_set & clone_set)
+            if not shared:
+                continue
+            overlap = shared / max(len(token_set), len(clone_set))
+            if overlap < _MIN_TOKEN_OVERLAP:
+                continue
+            if clone_chars < _AUTOJUNK_MIN_CHARS and (clone_text in text or text in clone_text):
+                # One text contains the other (e.g. a footer plus a copyright year):
+                # the longest match is the whole shorter text and nothing is left
+                # over, so ratio() is exactly the length bound. Below difflib's
+                # autojunk size no characters are junked, which keeps this exact.
+                best_score = length_bound
+                best_index = index
+                continue
+            matcher = self.matchers.get(clone_text)
+            if matcher is None:
+                matcher = SequenceMatcher(None, b=clone_text)
+                self.matchers[clone_text] = matcher
+            matcher.set_seq1(text)
+            quick = matcher.quick_ratio()
+            if quick < self.quick_floor or quick <= best_score:
+                continue
+            score = matcher.ratio()
+            if score > best_score:
+                best_score = score
+                best_index = index
+        return best_index, best_score
+
+    @classmethod
+    def _build_prefix_index(cls, clones: list[_TextKey]) -> tuple[dict[str, int], dict[str, list[int]]]:
+        """Index each clone entry under the rarest tokens of its token set.
+
+        Two sets sharing at least ``t`` tokens must share one of their first
+        ``len - t + 1`` tokens under a common ordering, so probing with the base
+        prefix finds every pair that can pass the overlap floor.
+        """
+        frequency: dict[str, int] = defaultdict(int)
+        for _text, _length, token_set in clones:
+            for token in token_set:
+                frequency[token] += 1
+        rank = {token: position for position, token in enumerate(sorted(frequency, key=lambda t: (frequency[t], t)))}
+        index: dict[str, list[int]] = defaultdict(list)
+        for position, (_text, _length, token_set) in enumerate(clones):
+            for token in cls._token_prefix(token_set, rank):
+                index[token].append(position)
+        return rank, index
+
+    @staticmethod
+    def _token_prefix(token_set: frozenset[str], rank: dict[str, int]) -> list[str]:
+        # Tokens unseen on the clone side sort first; they cannot produce candidates.
+        ordered = sorted(token_set, key=lambda token: (rank.get(token, -1), token))
+        required = max(1, int(len(ordered) * _MIN_TOKEN_OVERLAP))
+        return ordered[: len(ordered) - required + 1]
+
+
 __all__ = ["Comparer"]
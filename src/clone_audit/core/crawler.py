@@ -4,13 +4,13 @@ from __future__ import annotations
 import logging
 from collections import deque
 from datetime import datetime
-from queue import Empty, Queue
+from queue import Queue
 from threading import Event, Lock, Thread
 from time import monotonic, perf_counter
 from typing import Deque
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..config import CrawlConfig
 from .models import CrawlResult, PageSnapshot
@@ -18,6 +18,9 @@ from ..utils import is_html_content, is_same_domain, normalize_url, resolve_url,
 
 logger = logging.getLogger(__name__)
 
+# Link discovery only needs anchors, so skip building the rest of the tree.
+_ANCHORS_ONLY = SoupStrainer("a", href=True)
+
 
 class Crawler:
     """Breadth-first crawler constrained to a single site."""
@@ -76,20 +79,10 @@ class Crawler:
                 continue
 
             discovered: list[str] = []
-            if html:
-                soup = BeautifulSoup(html, "html.parser")
-                for tag in soup.find_all("a", href=True):
-                    link_url = resolve_url(normalized, tag.get("href"))
-                    if not link_url:
-                        continue
-                    link_normalized = normalize_url(link_url)
-                    if self.config.same_domain_only and not is_same_domain(
-                        link_normalized, self.config.base_url
-                    ):
-                        continue
-                    if link_normalized not in visited:
-                        discovered.append(link_normalized)
-                        queue.append((link_normalized, depth + 1))
+            for link_normalized in self._discover_links(normalized, html):
+                if link_normalized not in visited:
+                    discovered.append(link_normalized)
+                    queue.append((link_normalized, depth + 1))
 
             snapshot = PageSnapshot(
                 url=normalized,
@@ -109,9 +102,12 @@ class Crawler:
 
     def _crawl_parallel(self) -> CrawlResult:
         work_queue: Queue[tuple[str, int] | None] = Queue()
-        work_queue.put((self.config.base_url, 0))
-        visited: set[str] = set()
-        visited_lock = Lock()
+        # URLs are normalised and claimed before they are queued, so each one is
+        # fetched at most once and never sits in the queue twice. The visited set
+        # is sharded to keep workers from contending on a single lock.
+        shard_count = max(1, self.config.page_concurrency * 2)
+        visited_shards: list[set[str]] = [set() for _ in range(shard_count)]
+        visited_locks = [Lock() for _ in range(shard_count)]
         snapshots: list[PageSnapshot] = []
         snapshots_lock = Lock()
         errors: list[str] = []
@@ -121,105 +117,102 @@ class Crawler:
         last_request = [monotonic() - self.config.delay_seconds]
 
         def create_session() -> requests.Session:
+            # Workers keep their own Session (cookie jars are not thread-safe) but
+            # mount the parent's adapters, so fetches share its connection pool
+            # and retry policy instead of opening fresh connections per worker.
             session = requests.Session()
             session.headers.update(self.session.headers)
             session.headers["User-Agent"] = self.config.user_agent
+            for prefix, adapter in self.session.adapters.items():
+                session.mount(prefix, adapter)
             return session
 
         def acquire_request_slot() -> None:
+            if self.config.delay_seconds <= 0:
+                # No politeness delay: nothing to serialise, so skip the lock.
+                return
             with request_lock:
-                if self.config.delay_seconds <= 0:
-                    last_request[0] = monotonic()
-                    return
                 now = monotonic()
                 wait = self.config.delay_seconds - (now - last_request[0])
                 if wait > 0:
                     sleep(wait)
                 last_request[0] = monotonic()
 
+        def enqueue(normalized: str, depth: int) -> None:
+            if depth > self.config.max_depth:
+                return
+            shard = hash(normalized) % shard_count
+            with visited_locks[shard]:
+                if normalized in visited_shards[shard]:
+                    return
+                visited_shards[shard].add(normalized)
+            work_queue.put((normalized, depth))
+
+        def fetch(session: requests.Session, normalized: str, depth: int) -> None:
+            if completion_event.is_set():
+                return
+            acquire_request_slot()
+            try:
+                response = session.get(
+                    normalized,
+                    timeout=self.config.timeout,
+                    allow_redirects=True,
+                )
+                status_code = response.status_code
+                content_type = response.headers.get("Content-Type")
+                html = response.text if is_html_content(content_type) else ""
+            except requests.RequestException as exc:  # pragma: no cover - network edge
+                with errors_lock:
+                    errors.append(f"{normalized}: {exc}")
+                return
+
+            discovered = self._discover_links(normalized, html)
+            if not completion_event.is_set():
+                for link_normalized in discovered:
+                    enqueue(link_normalized, depth + 1)
+
+            snapshot = PageSnapshot(
+                url=normalized,
+                depth=depth,
+                status_code=status_code,
+                html=html,
+                content_type=content_type,
+                fetched_at=datetime.utcnow(),
+                discovered_urls=discovered,
+            )
+            reached_limit = False
+            with snapshots_lock:
+                if len(snapshots) < self.config.max_pages:
+                    snapshots.append(snapshot)
+                    reached_limit = len(snapshots) >= self.config.max_pages
+                else:
+                    reached_limit = True
+            if reached_limit:
+                completion_event.set()
+
         def worker() -> None:
+            # Not closed afterwards: closing would shut the parent's shared adapters.
             session = create_session()
-            try:
-                while True:
-                    try:
-                        item = work_queue.get(timeout=0.1)
-                    except Empty:
-                        if completion_event.is_set():
-                            break
-                        continue
-                    if item is None:
-                        work_queue.task_done()
-                        break
-                    url, depth = item
-                    if completion_event.is_set():
-                        work_queue.task_done()
-                        continue
-
-                    normalized = normalize_url(url)
-                    with visited_lock:
-                        if normalized in visited:
-                            work_queue.task_done()
-                            continue
-                        visited.add(normalized)
-
-                    if depth > self.config.max_depth:
-                        work_queue.task_done()
-                        continue
-
-                    acquire_request_slot()
-                    try:
-                        response = session.get(
-                            normalized,
-                            timeout=self.config.timeout,
-                            allow_redirects=True,
-                        )
-                        status_code = response.status_code
-                        content_type = response.headers.get("Content-Type")
-                        html = response.text if is_html_content(content_type) else ""
-                    except requests.RequestException as exc:  # pragma: no cover - network edge
-                        with errors_lock:
-                            errors.append(f"{normalized}: {exc}")
-                        work_queue.task_done()
-                        continue
-
-                    discovered: list[str] = []
-                    if html:
-                        soup = BeautifulSoup(html, "html.parser")
-                        for tag in soup.find_all("a", href=True):
-                            link_url = resolve_url(normalized, tag.get("href"))
-                            if not link_url:
-                                continue
-                            link_normalized = normalize_url(link_url)
-                            if self.config.same_domain_only and not is_same_domain(
-                                link_normalized, self.config.base_url
-                            ):
-                                continue
-                            discovered.append(link_normalized)
-                            if not completion_event.is_set():
-                                work_queue.put((link_normalized, depth + 1))
-
-                    snapshot = PageSnapshot(
-                        url=normalized,
-                        depth=depth,
-                        status_code=status_code,
-                        html=html,
-                        content_type=content_type,
-                        fetched_at=datetime.utcnow(),
-                        discovered_urls=discovered,
-                    )
-                    reached_limit = False
-                    with snapshots_lock:
-                        if len(snapshots) < self.config.max_pages:
-                            snapshots.append(snapshot)
-                            reached_limit = len(snapshots) >= self.config.max_pages
-                        else:
-                            reached_limit = True
-                    if reached_limit:
-                        completion_event.set()
+            while True:
+                # Block until there is work; the main thread sends one None per
+                # worker once work_queue.join() sees every item finished.
+                item = work_queue.get()
+                if item is None:
+                    work_queue.task_done()
+                    break
+                url, depth = item
+                # Every dequeued item must be marked done, even if processing it
+                # blows up, or work_queue.join() below never returns.
+                try:
+                    fetch(session, url, depth)
+                except Exception as exc:
+                    logger.exception("Crawler worker failed on %s", url)
+                    with errors_lock:
+                        errors.append(f"{url}: {exc}")
+                finally:
                     work_queue.task_done()
-            finally:
-                session.close()
 
+        enqueue(normalize_url(self.config.base_url), 0)
         threads = [Thread(target=worker, name=f"crawler-worker-{i}") for i in range(self.config.page_concurrency)]
         for thread in threads:
             thread.daemon = True
@@ -234,5 +227,23 @@ class Crawler:
 
         return CrawlResult(root_url=self.config.base_url, snapshots=snapshots, errors=errors)
 
+    def _discover_links(self, page_url: str, html: str) -> list[str]:
+        """Return normalised in-scope links found in ``<a href>`` tags."""
+        if not html:
+            return []
+        links: list[str] = []
+        soup = BeautifulSoup(html, "html.parser", parse_only=_ANCHORS_ONLY)
+        for tag in soup.find_all("a", href=True):
+            link_url = resolve_url(page_url, tag.get("href"))
+            if not link_url:
+                continue
+            link_normalized = normalize_url(link_url)
+            if self.config.same_domain_only and not is_same_domain(
+                link_normalized, self.config.base_url
+            ):
+                continue
+            links.append(link_normalized)
+        return links
+
 
 __all__ = ["Crawler"]
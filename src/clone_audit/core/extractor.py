@@ -3,8 +3,16 @@ from __future__ import annotations
 
 import io
 import logging
+import re
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 from time import perf_counter
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Iterator, Optional
+from urllib.parse import urlparse
 
 import numpy as np
 import requests
@@ -14,175 +22,370 @@ from bs4 import BeautifulSoup, Tag
 from ..config import ExtractionConfig
 from .models import CrawlResult, ImageArtifact, SiteArtifacts, StructureSignature, TextArtifact
 from ..utils import (
+    cached_tokens,
     clean_text,
-    iter_block_candidates,
+    is_block_candidate,
     normalize_url,
     resolve_url,
-    tokenize_text,
 )
 
+try:  # pragma: no cover - optional dependency
+    import lxml  # type: ignore  # noqa: F401
+except ImportError:  # pragma: no cover - optional dependency
+    lxml = None  # type: ignore
+
 _HASH_SIZE = 8
 _MAX_STRUCTURE_TAGS = 600
+# Images larger than this are recorded by size only; they are not downloaded in full.
+_MAX_IMAGE_BYTES = 8 * 1024 * 1024
+_IMAGE_CHUNK_BYTES = 64 * 1024
+_DISK_CACHE_MAX_AGE = 7 * 24 * 3600.0
+# <img> elements below this declared size (tracking pixels, spacers) carry no
+# usable aHash signal.
+_MIN_IMAGE_DIMENSION = 16
+# PIL cannot rasterise SVG, so fetching one only yields an unhashable failure.
+_UNHASHABLE_SUFFIXES = (".svg", ".svgz")
+# Whole path segments only ("/pixel/", "/pixel.gif"); "/pixels/hero.jpg" or
+# "/analytics-dashboard/shot.png" are real content images.
+_TRACKER_PATH_RE = re.compile(r"(?:^|/)(?:pixel|tracking|analytics)(?:/|\.|$)")
+
+_ImageMetadata = tuple[Optional[str], Optional[int], Optional[str], Optional[bytes]]
 
 logger = logging.getLogger(__name__)
 
 
 class Extractor:
-    """Extracts text, image, and structural signals from crawled pages."""
+    """Extracts text, image, and structural signals from crawled pages.
+
+    A single instance may extract several crawls concurrently; the image cache
+    only ever gains complete entries, so racing fetches at worst duplicate work.
+    Failed fetches are cached for the current audit only, so an asset that
+    appears on every page is not re-fetched per page; long-lived owners should
+    call ``clear_cache`` between audits, which also gives failures a retry.
+    When ``image_cache_path`` is configured, successful fetches are also kept
+    in an on-disk cache that outlives ``clear_cache`` and the process.
+    """
 
     def __init__(self, config: ExtractionConfig, session: Optional[requests.Session] = None) -> None:
+        if config.html_parser == "lxml" and lxml is None:
+            raise ValueError("html_parser='lxml' requires the lxml package")
         self.config = config
-        self.session = session or requests.Session()
-        self._image_cache: Dict[str, tuple[Optional[str], Optional[int], Optional[str], Optional[bytes]]] = {}
+        self.session = session or self._build_session(config.image_concurrency)
+        self._image_cache: Dict[str, _ImageMetadata] = {}
+        self._disk_cache = _ImageDiskCache(config.image_cache_path) if config.image_cache_path else None
+        # One pool for the extractor's lifetime; threads start on first use and
+        # are reused for every page instead of being spawned and joined per page.
+        self._image_pool: Optional[ThreadPoolExecutor] = None
+        if config.image_concurrency > 1:
+            self._image_pool = ThreadPoolExecutor(
+                max_workers=config.image_concurrency, thread_name_prefix="clone-audit-img"
+            )
+
+    @staticmethod
+    def _build_session(image_concurrency: int) -> requests.Session:
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        pool_size = max(10, image_concurrency)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def clear_cache(self) -> None:
+        self._image_cache.clear()
+
+    def close(self) -> None:
+        if self._image_pool is not None:
+            self._image_pool.shutdown(wait=True)
+        self.session.close()
+        if self._disk_cache is not None:
+            self._disk_cache.close()
 
     def extract(self, crawl_result: CrawlResult) -> SiteArtifacts:
         start = perf_counter()
         artifacts = SiteArtifacts(crawl=crawl_result)
+        skipped_images = 0
         for snapshot in crawl_result.snapshots:
             if not snapshot.html:
                 continue
-            soup = BeautifulSoup(snapshot.html, "html.parser")
+            soup = BeautifulSoup(snapshot.html, self.config.html_parser)
+            blocks, img_tags, tag_names = self._collect_tags(soup)
 
             if self.config.collect_text:
-                artifacts.texts.extend(self._extract_text(snapshot.url, soup))
+                artifacts.texts.extend(self._extract_text(snapshot.url, blocks))
 
             if self.config.collect_images:
-                artifacts.images.extend(self._extract_images(snapshot.url, soup))
+                urls, skipped = self._image_urls(snapshot.url, img_tags)
+                skipped_images += skipped
+                artifacts.images.extend(self._extract_images(snapshot.url, urls))
 
             if self.config.collect_structure:
-                signature = self._extract_structure(snapshot.url, snapshot.depth, soup)
+                signature = self._extract_structure(snapshot.url, snapshot.depth, tag_names)
                 if signature:
                     artifacts.structures.append(signature)
         duration = perf_counter() - start
         logger.info(
-            "Extracted artefacts from %s pages in %.2fs (text=%s, images=%s, structure=%s)",
+            "Extracted artefacts from %s pages in %.2fs (text=%s, images=%s, skipped_images=%s, structure=%s)",
             len(crawl_result.snapshots),
             duration,
             len(artifacts.texts),
             len(artifacts.images),
+            skipped_images,
             len(artifacts.structures),
         )
         return artifacts
 
-    def _extract_text(self, page_url: str, soup: BeautifulSoup) -> Iterable[TextArtifact]:
-        entries: list[TextArtifact] = []
-        for tag in iter_block_candidates(soup):
-            if not isinstance(tag, Tag):
+    def _collect_tags(self, soup: BeautifulSoup) -> tuple[list[Tag], list[Tag], list[str]]:
+        # One walk over the parsed tree feeds all three collectors; separate
+        # find_all calls would each re-walk every node of the page.
+        blocks: list[Tag] = []
+        img_tags: list[Tag] = []
+        tag_names: list[str] = []
+        collect_text = self.config.collect_text
+        collect_images = self.config.collect_images
+        collect_structure = self.config.collect_structure
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
                 continue
+            name = element.name
+            if collect_structure and len(tag_names) < _MAX_STRUCTURE_TAGS:
+                # The tag alphabet is tiny; interning shares one string per name.
+                tag_names.append(sys.intern(name))
+            elif not (collect_text or collect_images):
+                break  # structure-only runs need no more than the capped prefix
+            if collect_text and is_block_candidate(element):
+                blocks.append(element)
+            if collect_images and name == "img":
+                img_tags.append(element)
+        return blocks, img_tags, tag_names
+
+    def _extract_text(self, page_url: str, blocks: Iterable[Tag]) -> Iterator[TextArtifact]:
+        sibling_indices: Dict[int, Dict[int, int]] = {}
+        paths: Dict[int, str] = {}
+        for tag in blocks:
             text = clean_text(tag.get_text(separator=" "))
             if len(text) < self.config.min_text_length:
                 continue
             if len(text) > self.config.max_text_length:
                 text = text[: self.config.max_text_length]
-            locator = self._dom_path(tag)
-            tokens = tokenize_text(text)
+            tokens = cached_tokens(text)
             if not tokens:
                 continue
-            entries.append(
-                TextArtifact(
-                    page_url=page_url,
-                    locator=locator,
-                    text=text,
-                    token_count=len(tokens),
-                    tokens=tuple(tokens),
-                )
+            yield TextArtifact(
+                page_url=page_url,
+                locator=self._dom_path(tag, sibling_indices, paths),
+                text=text,
+                token_count=len(tokens),
+                token_set=frozenset(tokens),
             )
-        return entries
 
-    def _extract_images(self, page_url: str, soup: BeautifulSoup) -> Iterable[ImageArtifact]:
-        images: list[ImageArtifact] = []
-        for img in soup.find_all("img"):
-            if not isinstance(img, Tag):
-                continue
+    def _image_urls(self, page_url: str, img_tags: Iterable[Tag]) -> tuple[list[str], int]:
+        """Return the image URLs worth fetching and how many were skipped as noise."""
+        urls: list[str] = []
+        skipped = 0
+        for img in img_tags:
             src = img.get("src")
             full_url = resolve_url(page_url, src)
             if not full_url or full_url.startswith("data:"):
                 continue
             normalized = normalize_url(full_url)
-            hash_bits, size_bytes, content_type, preview_bytes = self._fetch_image_metadata(normalized)
-            images.append(
-                ImageArtifact(
-                    page_url=page_url,
-                    url=normalized,
-                    hash_bits=hash_bits,
-                    bytes_size=size_bytes,
-                    content_type=content_type,
-                    preview_bytes=preview_bytes,
-                )
+            if self._is_noise_image(img, normalized):
+                skipped += 1
+                continue
+            urls.append(normalized)
+        return urls, skipped
+
+    @staticmethod
+    def _is_noise_image(img: Tag, url: str) -> bool:
+        path = urlparse(url).path.lower()
+        if path.endswith(_UNHASHABLE_SUFFIXES) or _TRACKER_PATH_RE.search(path):
+            return True
+        for attribute in ("width", "height"):
+            value = img.get(attribute)
+            if isinstance(value, str) and value.strip().isdigit() and int(value) < _MIN_IMAGE_DIMENSION:
+                return True
+        return False
+
+    def _extract_images(self, page_url: str, urls: list[str]) -> Iterator[ImageArtifact]:
+        metadata = self._fetch_all_image_metadata(urls)
+        for normalized in urls:
+            hash_bits, size_bytes, content_type, preview_bytes = metadata[normalized]
+            yield ImageArtifact(
+                page_url=page_url,
+                url=normalized,
+                hash_bits=hash_bits,
+                bytes_size=size_bytes,
+                content_type=content_type,
+                preview_bytes=preview_bytes,
             )
-        return images
 
-    def _extract_structure(self, page_url: str, depth: int, soup: BeautifulSoup) -> Optional[StructureSignature]:
-        tags: list[str] = []
-        for element in soup.find_all(True, limit=_MAX_STRUCTURE_TAGS):
-            if isinstance(element, Tag):
-                tags.append(element.name)
+    def _extract_structure(self, page_url: str, depth: int, tags: list[str]) -> Optional[StructureSignature]:
         if not tags:
             return None
-        return StructureSignature(page_url=page_url, depth=depth, tag_sequence=tuple(tags))
+        return StructureSignature(
+            page_url=page_url,
+            depth=depth,
+            tag_sequence=tuple(tags),
+            tag_set=frozenset(tags),
+        )
 
-    def _fetch_image_metadata(
-        self, url: str
-    ) -> tuple[Optional[str], Optional[int], Optional[str], Optional[bytes]]:
+    def _fetch_all_image_metadata(
+        self, urls: list[str]
+    ) -> dict[str, _ImageMetadata]:
+        # Image downloads are latency-bound, so overlap them instead of paying one
+        # round trip per <img>; results are keyed by URL to keep page order.
+        unique = list(dict.fromkeys(urls))
+        if self._image_pool is None or len(unique) <= 1:
+            return {url: self._fetch_image_metadata(url) for url in unique}
+        return dict(zip(unique, self._image_pool.map(self._fetch_image_metadata, unique)))
+
+    def _fetch_image_metadata(self, url: str) -> _ImageMetadata:
         if url in self._image_cache:
             return self._image_cache[url]
+        if self._disk_cache is not None:
+            stored = self._disk_cache.get(url)
+            if stored is not None:
+                self._image_cache[url] = stored
+                return stored
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            content_type = response.headers.get("Content-Type")
-            content = response.content
-            size_bytes = len(content)
+            response = self.session.get(url, timeout=10, stream=True)
+            try:
+                response.raise_for_status()
+                content_type = response.headers.get("Content-Type")
+                size_bytes, content = self._read_image_body(response)
+            finally:
+                response.close()
             hash_bits = None
             preview_bytes = None
             if content_type and "image" in content_type and content:
-                hash_bits = self._average_hash(content)
-                preview_bytes = self._create_preview(content)
+                hash_bits, preview_bytes = self._hash_and_preview(content)
         except (requests.RequestException, UnidentifiedImageError, OSError):  # pragma: no cover - network edge
-            self._image_cache[url] = (None, None, None, None)
-            return (None, None, None, None)
+            # Remembered for this audit only; the disk cache never stores failures.
+            failure: _ImageMetadata = (None, None, None, None)
+            self._image_cache[url] = failure
+            return failure
         result = (hash_bits, size_bytes, content_type, preview_bytes)
         self._image_cache[url] = result
+        if self._disk_cache is not None:
+            self._disk_cache.put(url, result)
         return result
 
-    def _average_hash(self, content: bytes) -> Optional[str]:
-        with Image.open(io.BytesIO(content)) as img:
-            image = img.convert("L").resize((_HASH_SIZE, _HASH_SIZE), Image.LANCZOS)
-        pixels = np.asarray(image, dtype=float)
-        avg = pixels.mean()
-        bits = pixels > avg
-        bit_string = "".join("1" if bit else "0" for bit in bits.flatten())
-        value = int(bit_string, 2)
-        return f"{value:0{_HASH_SIZE * _HASH_SIZE // 4}x}"
-
-    def _create_preview(self, content: bytes) -> Optional[bytes]:
+    @staticmethod
+    def _read_image_body(response: requests.Response) -> tuple[int, Optional[bytes]]:
+        """Return the body size and bytes, or ``None`` bytes when it exceeds the cap."""
+        declared = response.headers.get("Content-Length")
+        if declared and declared.isdigit() and int(declared) > _MAX_IMAGE_BYTES:
+            return int(declared), None
+        chunks: list[bytes] = []
+        received = 0
+        for chunk in response.iter_content(_IMAGE_CHUNK_BYTES):
+            received += len(chunk)
+            if received > _MAX_IMAGE_BYTES:
+                # Undeclared or understated length: stop reading and keep a lower bound.
+                return received, None
+            chunks.append(chunk)
+        return received, b"".join(chunks)
+
+    def _hash_and_preview(self, content: bytes) -> tuple[Optional[str], Optional[bytes]]:
+        # Decode once and derive both the hash and the preview from the same image.
+        # The hash needs the full-resolution decode: draft() scaling or a cheaper
+        # resampling filter shifts aHash bits and breaks comparisons with stored hashes.
         with Image.open(io.BytesIO(content)) as img:
-            preview = img.convert("RGB")
-            preview.thumbnail((320, 320))
-            buffer = io.BytesIO()
-            preview.save(buffer, format="PNG")
-            return buffer.getvalue()
-
-    def _dom_path(self, tag: Tag) -> str:
-        parts: list[str] = []
+            img.load()
+            return self._average_hash(img), self._create_preview(img)
+
+    def _average_hash(self, img: Image.Image) -> Optional[str]:
+        gray = img if img.mode == "L" else img.convert("L")  # convert() copies even when already L
+        image = gray.resize((_HASH_SIZE, _HASH_SIZE), Image.LANCZOS)
+        pixels = np.asarray(image, dtype=np.uint8)
+        packed = np.packbits((pixels > pixels.mean()).reshape(-1))
+        return packed.tobytes().hex()
+
+    def _create_preview(self, img: Image.Image) -> Optional[bytes]:
+        preview = img.convert("RGB")
+        preview.thumbnail((320, 320))
+        buffer = io.BytesIO()
+        preview.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def _dom_path(self, tag: Tag, sibling_indices: Dict[int, Dict[int, int]], paths: Dict[int, str]) -> str:
+        # Block candidates nest and share ancestors, so only climb until an
+        # ancestor whose path this page has already formatted.
+        pending: list[Tag] = []
+        prefix = ""
         current: Optional[Tag] = tag
         while current and isinstance(current, Tag):
-            index = self._sibling_index(current)
-            part = current.name
+            known = paths.get(id(current))
+            if known is not None:
+                prefix = known
+                break
+            pending.append(current)
+            current = current.parent  # type: ignore[assignment]
+        for node in reversed(pending):
+            index = self._sibling_index(node, sibling_indices)
+            part = node.name
             if index > 1:
                 part = f"{part}[{index}]"
-            parts.append(part)
-            current = current.parent  # type: ignore[assignment]
-        return "/".join(reversed(parts))
+            prefix = f"{prefix}/{part}" if prefix else part
+            paths[id(node)] = prefix
+        return prefix
 
     @staticmethod
-    def _sibling_index(tag: Tag) -> int:
-        count = 1
-        sibling = tag.previous_sibling
-        while sibling:
-            if isinstance(sibling, Tag) and sibling.name == tag.name:
-                count += 1
-            sibling = sibling.previous_sibling
-        return count
+    def _sibling_index(tag: Tag, sibling_indices: Dict[int, Dict[int, int]]) -> int:
+        # Number every child of a parent in one scan; later blocks under the same
+        # ancestors then look their position up instead of re-walking siblings.
+        parent = tag.parent
+        if parent is None:
+            return 1
+        indices = sibling_indices.get(id(parent))
+        if indices is None:
+            indices = {}
+            counts: Dict[str, int] = defaultdict(int)
+            for child in parent.contents:
+                if isinstance(child, Tag):
+                    counts[child.name] += 1
+                    indices[id(child)] = counts[child.name]
+            sibling_indices[id(parent)] = indices
+        return indices[id(tag)]
+
+
+
+class _ImageDiskCache:
+    """SQLite-backed image metadata keyed by normalised URL, shared across runs."""
+
+    def __init__(self, path: str, max_age_seconds: float = _DISK_CACHE_MAX_AGE) -> None:
+        self._max_age = max_age_seconds
+        self._lock = Lock()
+        # Image fetches run on worker threads; the lock serialises access instead.
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS images ("
+                "url TEXT PRIMARY KEY, hash_bits TEXT, size_bytes INTEGER, "
+                "content_type TEXT, preview BLOB, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, url: str) -> Optional[_ImageMetadata]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT hash_bits, size_bytes, content_type, preview, stored_at FROM images WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None or time.time() - row[4] > self._max_age:
+            return None
+        return row[0], row[1], row[2], row[3]
+
+    def put(self, url: str, metadata: _ImageMetadata) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO images VALUES (?, ?, ?, ?, ?, ?)",
+                (url, *metadata, time.time()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
 
 
 __all__ = ["Extractor"]
@@ -18,19 +18,20 @@ class PageSnapshot:
     error: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class TextArtifact:
     page_url: str
     locator: str
     text: str
     token_count: int
     tokens: tuple[str, ...] = tuple()
+    token_set: frozenset[str] = frozenset()
 
     def snippet(self, length: int = 200) -> str:
         return self.text[:length].strip()
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ImageArtifact:
     page_url: str
     url: str
@@ -40,11 +41,12 @@ class ImageArtifact:
     preview_bytes: Optional[bytes] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class StructureSignature:
     page_url: str
     depth: int
     tag_sequence: tuple[str, ...]
+    tag_set: frozenset[str] = frozenset()
 
 
 @dataclass(slots=True)
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import json
 import socket
-from dataclasses import dataclass
+from threading import Lock
 from typing import Any, Optional
 from urllib.parse import urlparse
 
@@ -13,16 +13,28 @@ from .models import HostingRecord
 
 _USER_AGENT = "clone-audit-hosting/1.0"
 _RDAP_TIMEOUT = 10.0
+_RDAP_CACHE_SIZE = 256
 
 
-@dataclass(slots=True)
-class _ParsedEntity:
-    name: Optional[str]
-    roles: tuple[str, ...]
+# Prefer registrant / organisation style roles, in this order.
+_PREFERRED_ROLES = {
+    role: rank
+    for rank, role in enumerate(("registrant", "administrative", "technical", "abuse", "billing"))
+}
 
 
 class HostingClient:
-    """Resolve hosting provider details via RDAP."""
+    """Resolve hosting provider details via RDAP.
+
+    Successful RDAP responses are remembered per IP address, so sites that
+    share a host (or a CDN edge) are only looked up once per client.
+    """
+
+    def __init__(self) -> None:
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": _USER_AGENT, "Accept": "application/rdap+json"})
+        self._rdap_cache: dict[str, tuple[dict[str, Any], str]] = {}
+        self._rdap_lock = Lock()
 
     def lookup(self, target: str) -> HostingRecord:
         domain = self._extract_domain(target)
@@ -101,13 +113,13 @@ class HostingClient:
         return infos[0][4][0]
 
     def _fetch_rdap(self, ip: str) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+        with self._rdap_lock:
+            cached = self._rdap_cache.get(ip)
+        if cached is not None:
+            return cached
         rdap_url = f"https://rdap.org/ip/{ip}"
         try:
-            response = requests.get(
-                rdap_url,
-                timeout=_RDAP_TIMEOUT,
-                headers={"User-Agent": _USER_AGENT, "Accept": "application/rdap+json"},
-            )
+            response = self._session.get(rdap_url, timeout=_RDAP_TIMEOUT)
             response.raise_for_status()
         except requests.RequestException:
             return None, rdap_url
@@ -117,37 +129,39 @@ class HostingClient:
         except json.JSONDecodeError:
             return None, rdap_url
 
-        return data, response.url or rdap_url
+        # Failures above are not cached so a transient error is retried next time.
+        result = (data, response.url or rdap_url)
+        with self._rdap_lock:
+            self._rdap_cache[ip] = result
+            if len(self._rdap_cache) > _RDAP_CACHE_SIZE:
+                self._rdap_cache.pop(next(iter(self._rdap_cache)))
+        return result
 
     def _select_entity_name(self, rdap_data: dict[str, Any]) -> Optional[str]:
         entities = rdap_data.get("entities")
         if not isinstance(entities, list):
             return None
 
-        parsed_entities = []
+        # One pass over the entities: keep the named entity with the most
+        # preferred role, falling back to the first named entity of any role.
+        best_name: Optional[str] = None
+        best_rank = len(_PREFERRED_ROLES)
         for entity in entities:
             name = self._extract_vcard_name(entity)
-            roles = tuple(role.lower() for role in entity.get("roles", []) if isinstance(role, str))
-            parsed_entities.append(_ParsedEntity(name=name, roles=roles))
-
-        # Prefer registrant / organisation style roles
-        preferred_roles = (
-            "registrant",
-            "administrative",
-            "technical",
-            "abuse",
-            "billing",
-        )
-        for role in preferred_roles:
-            for entity in parsed_entities:
-                if entity.name and role in entity.roles:
-                    return entity.name
-
-        # Fallback to any named entity
-        for entity in parsed_entities:
-            if entity.name:
-                return entity.name
-        return None
+            if not name:
+                continue
+            ranks = [
+                _PREFERRED_ROLES.get(role.lower(), len(_PREFERRED_ROLES))
+                for role in entity.get("roles", [])
+                if isinstance(role, str)
+            ]
+            rank = min(ranks, default=len(_PREFERRED_ROLES))
+            if best_name is None or rank < best_rank:
+                best_name = name
+                best_rank = rank
+                if rank == 0:
+                    break
+        return best_name
 
     @staticmethod
     def _extract_vcard_name(entity: Any) -> Optional[str]:
@@ -3,9 +3,12 @@ from __future__ import annotations
 
 import base64
 import io
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from difflib import SequenceMatcher
+from operator import attrgetter
 from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import requests
@@ -20,16 +23,42 @@ from .models import (
     WhoisRecord,
 )
 from .screenshots import ScreenshotError, capture_homepage
-from .utils import canonical_path
+from .utils import canonical_path, encode_json
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from .analyzer import AnalysisResult
 
 
+_by_similarity = attrgetter("similarity")
+_IMAGE_PREFETCH_WORKERS = 8
+_WIDTH_TOLERANCE = 0.01
+
+
+@dataclass(slots=True, frozen=True)
+class _HostingComparison:
+    value: str  # stat-card value, e.g. "Match"
+    detail: str  # stat-card detail line
+    narrative: str  # key-highlights sentence
+
+
 class ReportBuilder:
     def __init__(self, config: ReportConfig) -> None:
         self.config = config
         self._image_sequence = 0
+        self._fetched_images: Dict[str, Optional[bytes]] = {}
+        # Match images mostly come from the two audited hosts, so keep-alive saves
+        # a connection and TLS handshake on every download after the first.
+        self._http = requests.Session()
+
+    def __enter__(self) -> "ReportBuilder":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections used for match image downloads."""
+        self._http.close()
 
     def build_markdown(self, analysis: "AnalysisResult") -> str:
         lines: List[str] = []
@@ -73,6 +102,10 @@ class ReportBuilder:
             lines.extend(self._render_errors(base_crawl.errors, clone_crawl.errors))
         return "\n".join(lines).strip() + "\n"
 
+    def build_json_bytes(self, analysis: "AnalysisResult") -> bytes:
+        """Serialise ``build_json`` as indented UTF-8, using orjson when installed."""
+        return encode_json(self.build_json(analysis))
+
     def build_json(self, analysis: "AnalysisResult") -> Dict[str, Any]:
         comparison = analysis.comparison
         return {
@@ -116,8 +149,10 @@ class ReportBuilder:
         pdf.add_page()
         pdf.set_title("Clone Similarity Report")
         self._image_sequence = 0
+        self._fetched_images.clear()
 
         comparison = analysis.comparison
+        self._prefetch_image_bytes(comparison.image_matches)
         self._pdf_add_header(pdf, analysis)
         pdf.ln(2)
         self._pdf_add_quick_stats(pdf, analysis)
@@ -143,7 +178,7 @@ class ReportBuilder:
         self._pdf_text(pdf, f"Base URL: {analysis.base.crawl.root_url}", line_height=6)
         self._pdf_text(pdf, f"Clone URL: {analysis.clone.crawl.root_url}", line_height=6)
 
-        generated = datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC")
+        generated = time.strftime("%Y-%m-%d %H:%M UTC", time.gmtime())
         self._pdf_text(pdf, f"Generated: {generated}", line_height=6)
 
     def _pdf_add_quick_stats(self, pdf, analysis: "AnalysisResult") -> None:
@@ -216,6 +251,17 @@ class ReportBuilder:
         return stats
 
     def _build_hosting_stat(self, analysis: "AnalysisResult") -> Optional[Dict[str, str]]:
+        comparison = self._compare_hosting(analysis)
+        if comparison is None:
+            return None
+        return {
+            "title": "Hosting Lookup",
+            "value": comparison.value,
+            "detail": comparison.detail,
+        }
+
+    def _compare_hosting(self, analysis: "AnalysisResult") -> Optional[_HostingComparison]:
+        """Classify base vs clone hosting once for both the stat card and the highlights."""
         base_host = getattr(analysis, "base_hosting", None)
         clone_host = getattr(analysis, "clone_hosting", None)
         if base_host is None and clone_host is None:
@@ -225,51 +271,49 @@ class ReportBuilder:
         clone_name = self._preferred_host_name(clone_host)
 
         if base_host and base_host.error and clone_host and clone_host.error:
-            return {
-                "title": "Hosting Lookup",
-                "value": "Unavailable",
-                "detail": "Both RDAP lookups failed",
-            }
+            return _HostingComparison(
+                "Unavailable",
+                "Both RDAP lookups failed",
+                "Hosting lookups failed for both sites",
+            )
 
         if base_name and clone_name:
-            same_provider = self._normalize_host_label(base_name) == self._normalize_host_label(clone_name)
-            value = "Match" if same_provider else "Different"
-            detail = base_name if same_provider else f"{base_name} vs {clone_name}"
-            return {
-                "title": "Hosting Lookup",
-                "value": value,
-                "detail": detail,
-            }
+            if self._normalize_host_label(base_name) == self._normalize_host_label(clone_name):
+                return _HostingComparison("Match", base_name, f"Both sites appear hosted by {base_name}")
+            return _HostingComparison(
+                "Different",
+                f"{base_name} vs {clone_name}",
+                f"Hosting differs: {base_name} vs {clone_name}",
+            )
 
         if base_name or clone_name:
             known = base_name or clone_name
             context = "base" if base_name else "clone"
-            return {
-                "title": "Hosting Lookup",
-                "value": "Partial",
-                "detail": f"Only {context} resolved to {known}",
-            }
+            return _HostingComparison(
+                "Partial",
+                f"Only {context} resolved to {known}",
+                f"Only the {context} host resolved ({known})",
+            )
 
         # Fallback to IP comparison if names unavailable
         base_ip = base_host.ip if base_host else None
         clone_ip = clone_host.ip if clone_host else None
         if base_ip and clone_ip:
-            same_ip = base_ip == clone_ip
-            value = "Shared IP" if same_ip else "Separate IPs"
-            detail = f"{base_ip} vs {clone_ip}" if not same_ip else base_ip
-            return {
-                "title": "Hosting Lookup",
-                "value": value,
-                "detail": detail,
-            }
+            if base_ip == clone_ip:
+                return _HostingComparison("Shared IP", base_ip, f"Both sites share IP {base_ip}")
+            return _HostingComparison(
+                "Separate IPs",
+                f"{base_ip} vs {clone_ip}",
+                f"Hosting IPs differ: {base_ip} vs {clone_ip}",
+            )
         if base_ip or clone_ip:
             context = "base" if base_ip else "clone"
             ip_value = base_ip or clone_ip
-            return {
-                "title": "Hosting Lookup",
-                "value": "IP only",
-                "detail": f"Only {context} resolved ({ip_value})",
-            }
+            return _HostingComparison(
+                "IP only",
+                f"Only {context} resolved ({ip_value})",
+                f"Only the {context} IP resolved ({ip_value})",
+            )
         return None
 
     @staticmethod
@@ -360,7 +404,7 @@ class ReportBuilder:
             )
 
         if analysis.comparison.structure_matches:
-            structure_peak = max(analysis.comparison.structure_matches, key=lambda m: m.similarity)
+            structure_peak = max(analysis.comparison.structure_matches, key=_by_similarity)
             lines.append(
                 f"Structural reuse up to {structure_peak.similarity:.0%} on {self._truncate(structure_peak.clone.page_url)}"
             )
@@ -401,49 +445,21 @@ class ReportBuilder:
     def _top_text_match(matches: List[TextMatch]) -> Optional[TextMatch]:
         if not matches:
             return None
-        return max(matches, key=lambda match: match.similarity)
+        return max(matches, key=_by_similarity)
 
     @staticmethod
     def _top_image_match(matches: List[ImageMatch]) -> Optional[ImageMatch]:
         if not matches:
             return None
-        return max(matches, key=lambda match: match.similarity)
+        return max(matches, key=_by_similarity)
 
     def _hosting_alignment_summary(self, analysis: "AnalysisResult") -> Optional[str]:
-        base_host = getattr(analysis, "base_hosting", None)
-        clone_host = getattr(analysis, "clone_hosting", None)
-        if base_host is None and clone_host is None:
-            return None
-
-        base_name = self._preferred_host_name(base_host)
-        clone_name = self._preferred_host_name(clone_host)
-
-        if base_host and base_host.error and clone_host and clone_host.error:
-            return "Hosting lookups failed for both sites"
-
-        if base_name and clone_name:
-            if self._normalize_host_label(base_name) == self._normalize_host_label(clone_name):
-                return f"Both sites appear hosted by {base_name}"
-            return f"Hosting differs: {base_name} vs {clone_name}"
-
-        if base_name or clone_name:
-            name = base_name or clone_name
-            context = "base" if base_name else "clone"
-            return f"Only the {context} host resolved ({name})"
-
-        base_ip = base_host.ip if base_host else None
-        clone_ip = clone_host.ip if clone_host else None
-        if base_ip and clone_ip:
-            if base_ip == clone_ip:
-                return f"Both sites share IP {base_ip}"
-            return f"Hosting IPs differ: {base_ip} vs {clone_ip}"
-        if base_ip or clone_ip:
-            context = "base" if base_ip else "clone"
-            ip_value = base_ip or clone_ip
-            return f"Only the {context} IP resolved ({ip_value})"
-        return None
+        comparison = self._compare_hosting(analysis)
+        return comparison.narrative if comparison else None
 
     def _pdf_add_text_matches(self, pdf, matches: List[TextMatch]) -> None:
+        if not matches and self.config.skip_empty_sections:
+            return
         pdf.set_font("Helvetica", "B", 14)
         pdf.cell(0, 8, "Key Text Overlaps", ln=1)
 
@@ -508,6 +524,8 @@ class ReportBuilder:
         self._pdf_text(pdf, text, line_height=5.2)
 
     def _pdf_add_image_matches(self, pdf, matches: List[ImageMatch]) -> None:
+        if not matches and self.config.skip_empty_sections:
+            return
         pdf.set_font("Helvetica", "B", 14)
         pdf.cell(0, 8, "Visual Similarities", ln=1)
 
@@ -645,6 +663,8 @@ class ReportBuilder:
         return f"{prefix}_{self._image_sequence}.png"
 
     def _pdf_add_structure_summary(self, pdf, matches: List[StructureMatch]) -> None:
+        if not matches and self.config.skip_empty_sections:
+            return
         pdf.set_font("Helvetica", "B", 14)
         pdf.cell(0, 8, "Structural Echoes", ln=1)
 
@@ -693,21 +713,25 @@ class ReportBuilder:
             self._pdf_text(pdf, f"Error: {record.error}")
             pdf.ln(1)
             return
+        lines = []
         if record.ip:
-            self._pdf_text(pdf, f"IP: {record.ip}")
+            lines.append(f"IP: {record.ip}")
         name = self._preferred_host_name(record)
         if name:
-            self._pdf_text(pdf, f"Provider: {name}")
+            lines.append(f"Provider: {name}")
         elif record.network_name:
-            self._pdf_text(pdf, f"Network: {record.network_name}")
+            lines.append(f"Network: {record.network_name}")
         if record.country:
-            self._pdf_text(pdf, f"Country: {record.country}")
+            lines.append(f"Country: {record.country}")
         if record.source:
-            self._pdf_text(pdf, f"RDAP source: {record.source}")
+            lines.append(f"RDAP source: {record.source}")
+        self._pdf_text(pdf, "\n".join(lines))
         pdf.ln(1)
 
     def _render_text_matches(self, matches: List[TextMatch]) -> List[str]:
         if not matches:
+            if self.config.skip_empty_sections:
+                return []
             return ["## Text Matches", "- No high-similarity text matches detected", ""]
         lines = ["## Text Matches"]
         for match in matches:
@@ -726,6 +750,8 @@ class ReportBuilder:
 
     def _render_image_matches(self, matches: List[ImageMatch]) -> List[str]:
         if not matches:
+            if self.config.skip_empty_sections:
+                return []
             return ["## Image Matches", "- No matching image hashes detected", ""]
         lines = ["## Image Matches"]
         for match in matches:
@@ -742,6 +768,8 @@ class ReportBuilder:
 
     def _render_structure_matches(self, matches: List[StructureMatch]) -> List[str]:
         if not matches:
+            if self.config.skip_empty_sections:
+                return []
             return ["## Structural Matches", "- No structural overlaps above threshold", ""]
         lines = ["## Structural Matches"]
         for match in matches:
@@ -799,7 +827,7 @@ class ReportBuilder:
         if not lines:
             lines.append("- Hosting details unavailable")
         if self.config.include_raw_data and record.raw is not None:
-            raw_json = json.dumps(record.raw, indent=2, sort_keys=True)
+            raw_json = encode_json(record.raw, sort_keys=True).decode("utf-8")
             lines.append("- Raw RDAP:")
             lines.append("  ```json")
             for raw_line in raw_json.splitlines():
@@ -926,28 +954,48 @@ class ReportBuilder:
         if not text:
             return
         max_width = pdf.w - pdf.l_margin - pdf.r_margin
+        # The font is fixed for the whole block, so per-character widths can be shared across its lines.
+        char_widths: Dict[str, float] = {}
         for raw_line in text.splitlines() or [""]:
-            self._pdf_line(pdf, raw_line, max_width, line_height)
+            self._pdf_line(pdf, raw_line, max_width, line_height, char_widths)
 
-    def _pdf_line(self, pdf, text: str, max_width: float, line_height: float) -> None:
+    def _pdf_line(
+        self,
+        pdf,
+        text: str,
+        max_width: float,
+        line_height: float,
+        char_widths: Optional[Dict[str, float]] = None,
+    ) -> None:
         if text == "":
             pdf.cell(0, line_height, "", ln=1)
             return
-        buffer = ""
-        for char in text:
-            candidate = buffer + char
-            if pdf.get_string_width(candidate) <= max_width:
-                buffer = candidate
+        if char_widths is None:
+            char_widths = {}
+        start = 0
+        width = 0.0
+        for index, char in enumerate(text):
+            char_width = char_widths.get(char)
+            if char_width is None:
+                char_width = char_widths[char] = pdf.get_string_width(char)
+            width += char_width
+            if width < max_width - _WIDTH_TOLERANCE:
+                continue
+            # Near the edge the running sum may drift from fpdf's own measurement, so confirm it.
+            width = pdf.get_string_width(text[start : index + 1])
+            if width <= max_width:
                 continue
-            if buffer:
-                pdf.cell(0, line_height, buffer, ln=1)
-                buffer = char
+            if start < index:
+                pdf.cell(0, line_height, text[start:index], ln=1)
+                start = index
+                width = char_width
             else:
                 # Single character exceeds width; emit as-is to avoid infinite loop
                 pdf.cell(0, line_height, char, ln=1)
-                buffer = ""
-        if buffer:
-            pdf.cell(0, line_height, buffer, ln=1)
+                start = index + 1
+                width = 0.0
+        if start < len(text):
+            pdf.cell(0, line_height, text[start:], ln=1)
 
     def _add_homepage_section(self, pdf, analysis: "AnalysisResult") -> None:
         if not self.config.include_homepage or not self._should_capture_homepage(analysis):
@@ -973,12 +1021,13 @@ class ReportBuilder:
         pdf.ln(2)
 
     def _should_capture_homepage(self, analysis: "AnalysisResult") -> bool:
-        similarity = analysis.comparison.breakdown.overall_score
-        if similarity >= self.config.homepage_similarity_threshold:
+        threshold = self.config.homepage_similarity_threshold
+        if analysis.comparison.breakdown.overall_score >= threshold:
             return True
         root_path = canonical_path(analysis.base.crawl.root_url)
         for match in analysis.comparison.structure_matches:
-            if canonical_path(match.base.page_url) == root_path and match.similarity >= self.config.homepage_similarity_threshold:
+            # Check the score first; it is cheaper than resolving the page path.
+            if match.similarity >= threshold and canonical_path(match.base.page_url) == root_path:
                 return True
         return False
 
@@ -989,9 +1038,9 @@ class ReportBuilder:
         base_bytes: Optional[bytes] = None
         clone_bytes: Optional[bytes] = None
 
-        try:
-            base_bytes = capture_homepage(
-                analysis.base.crawl.root_url,
+        def capture(url: str) -> Optional[bytes]:
+            return capture_homepage(
+                url,
                 timeout=self.config.homepage_capture_timeout,
                 delay=self.config.homepage_render_delay,
                 width=self.config.homepage_width,
@@ -999,29 +1048,54 @@ class ReportBuilder:
                 method=self.config.homepage_capture_tool,
                 user_agent=self.config.homepage_user_agent,
             )
+
+        # Each capture is an independent headless-browser run; overlap the two.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            base_future = executor.submit(capture, analysis.base.crawl.root_url)
+            clone_future = executor.submit(capture, analysis.clone.crawl.root_url)
+
+        try:
+            base_bytes = base_future.result()
         except ScreenshotError as exc:
             errors.append(f"Base screenshot failed: {exc}")
 
         try:
-            clone_bytes = capture_homepage(
-                analysis.clone.crawl.root_url,
-                timeout=self.config.homepage_capture_timeout,
-                delay=self.config.homepage_render_delay,
-                width=self.config.homepage_width,
-                height=self.config.homepage_height,
-                method=self.config.homepage_capture_tool,
-                user_agent=self.config.homepage_user_agent,
-            )
+            clone_bytes = clone_future.result()
         except ScreenshotError as exc:
             errors.append(f"Clone screenshot failed: {exc}")
 
         return base_bytes, clone_bytes, errors
 
+    def _prefetch_image_bytes(self, matches: List[ImageMatch]) -> None:
+        # Previews are normally embedded already; the rest are downloaded up front
+        # in parallel rather than one at a time as each card is laid out.
+        urls = list(
+            dict.fromkeys(
+                artifact.url
+                for match in matches
+                for artifact in (match.base, match.clone)
+                if not artifact.preview_bytes
+            )
+        )
+        if len(urls) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(_IMAGE_PREFETCH_WORKERS, len(urls))) as executor:
+            self._fetched_images.update(zip(urls, executor.map(self._download_image, urls)))
+
     def _resolve_image_bytes(self, artifact: ImageArtifact) -> Optional[bytes]:
         if artifact.preview_bytes:
             return artifact.preview_bytes
+        # One asset often appears in several match rows; download it once per PDF.
+        # fpdf2 already de-duplicates identical bytes into a single XObject.
+        if artifact.url in self._fetched_images:
+            return self._fetched_images[artifact.url]
+        content = self._download_image(artifact.url)
+        self._fetched_images[artifact.url] = content
+        return content
+
+    def _download_image(self, url: str) -> Optional[bytes]:
         try:
-            response = requests.get(artifact.url, timeout=10)
+            response = self._http.get(url, timeout=10)
             response.raise_for_status()
             return response.content
         except requests.RequestException:
@@ -1035,12 +1109,15 @@ class ReportBuilder:
             self._pdf_text(pdf, f"Error: {record.error}")
             pdf.ln(1)
             return
-        self._pdf_text(pdf, f"Registrar: {record.registrar or 'Unknown'}")
-        self._pdf_text(pdf, f"Created: {self._format_date(record.creation_date)}")
-        self._pdf_text(pdf, f"Updated: {self._format_date(record.updated_date)}")
-        self._pdf_text(pdf, f"Expires: {self._format_date(record.expiration_date)}")
+        lines = [
+            f"Registrar: {record.registrar or 'Unknown'}",
+            f"Created: {self._format_date(record.creation_date)}",
+            f"Updated: {self._format_date(record.updated_date)}",
+            f"Expires: {self._format_date(record.expiration_date)}",
+        ]
         if record.name_servers:
-            self._pdf_text(pdf, "Name servers: " + ", ".join(record.name_servers))
+            lines.append("Name servers: " + ", ".join(record.name_servers))
+        self._pdf_text(pdf, "\n".join(lines))
         pdf.ln(2)
 
 
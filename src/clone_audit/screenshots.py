@@ -4,6 +4,7 @@ from __future__ import annotations
 import shutil
 import subprocess
 import tempfile
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -169,7 +170,9 @@ def _capture_with_wkhtml(
     return data
 
 
+@lru_cache(maxsize=1)
 def _find_chrome() -> Optional[str]:
+    # PATH is scanned once per process; call ``cache_clear()`` after installing Chrome.
     for candidate in _CHROME_BINARIES:
         path = shutil.which(candidate)
         if path:
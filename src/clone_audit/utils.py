@@ -1,13 +1,26 @@
 """Utility helpers for crawling and comparison."""
 from __future__ import annotations
 
+import json
 import re
 import time
 from collections.abc import Iterable
+from functools import lru_cache
 from typing import Iterable as IterableType, Iterator, Sequence
-from urllib.parse import urljoin, urlparse, urlunparse
+from urllib.parse import ParseResult, urljoin, urlparse, urlunparse
+
+try:  # pragma: no cover - optional dependency
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
 
 _WHITESPACE_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[\w']+")
+# For ASCII text ``[\w']`` is exactly letters, digits, underscore and apostrophe, so
+# blanking every other character and splitting gives the same tokens as _TOKEN_RE.
+_ASCII_TOKEN_SEPARATORS = str.maketrans(
+    {chr(code): " " for code in range(128) if not (chr(code).isalnum() or chr(code) in "_'")}
+)
 _BLOCK_TAGS = {
     "p",
     "div",
@@ -31,9 +44,12 @@ _BLOCK_TAGS = {
 
 
 
+# URL helpers are pure and hit repeatedly for the same links across pages and
+# both crawl paths, so they are memoised; call ``cache_clear()`` to release them.
+@lru_cache(maxsize=16384)
 def normalize_url(url: str, remove_fragment: bool = True) -> str:
     """Normalise URL for deduplication."""
-    parsed = urlparse(url)
+    parsed = _parse(url)
     scheme = parsed.scheme.lower() or "http"
     netloc = parsed.netloc.lower()
     path = parsed.path or "/"
@@ -52,9 +68,10 @@ def normalize_url(url: str, remove_fragment: bool = True) -> str:
     return urlunparse(normalized)
 
 
+@lru_cache(maxsize=16384)
 def canonical_path(url: str) -> str:
     """Return a path-based identifier for page comparison."""
-    parsed = urlparse(url)
+    parsed = _parse(url)
     path = parsed.path or "/"
     if parsed.query:
         path = f"{path}?{parsed.query}"
@@ -62,9 +79,18 @@ def canonical_path(url: str) -> str:
 
 
 def is_same_domain(url: str, root: str) -> bool:
-    root_host = urlparse(root).netloc.lower()
-    url_host = urlparse(url).netloc.lower()
-    return url_host == root_host
+    return _host(url) == _host(root)
+
+
+@lru_cache(maxsize=16384)
+def _host(url: str) -> str:
+    return _parse(url).netloc.lower()
+
+
+@lru_cache(maxsize=16384)
+def _parse(url: str) -> ParseResult:
+    # Shared by the helpers above so a URL seen by all three is parsed once.
+    return urlparse(url)
 
 
 def is_html_content(content_type: str | None) -> bool:
@@ -80,10 +106,22 @@ def clean_text(value: str) -> str:
     return _WHITESPACE_RE.sub(" ", value).strip()
 
 
+def tokenize_text(value: str) -> list[str]:
+    return list(cached_tokens(value))
 
 
-def tokenize_text(value: str) -> list[str]:
-    return [token.lower() for token in re.findall(r"[\w']+", value)]
+@lru_cache(maxsize=8192)
+def cached_tokens(value: str) -> tuple[str, ...]:
+    """Tokenise text, memoised because nav/footer blocks repeat on every page."""
+    if value.isascii():
+        return tuple(value.lower().translate(_ASCII_TOKEN_SEPARATORS).split())
+    return tuple(token.lower() for token in _TOKEN_RE.findall(value))
+
+
+def is_block_candidate(tag) -> bool:
+    """Return True when ``tag`` is one of the elements text is extracted from."""
+    return tag.name in _BLOCK_TAGS
+
 
 def iter_block_candidates(soup) -> Iterator:
     """Yield candidate nodes for text extraction."""
@@ -120,3 +158,18 @@ def chunked(iterable: IterableType, size: int) -> Iterator[list]:
             chunk = []
     if chunk:
         yield chunk
+
+
+def encode_json(payload: object, sort_keys: bool = False) -> bytes:
+    """Serialise ``payload`` as two-space indented UTF-8, using orjson when installed.
+
+    Both paths write non-ASCII text as raw UTF-8. For the report payloads (str
+    keys, strings, bools, ``None``, 64-bit ints and finite floats written
+    without an exponent) the bytes are the same either way; other values such
+    as ``1e-07``, NaN or non-str keys can differ or be rejected by orjson.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(payload, option=option)
+    # ensure_ascii=False mirrors orjson's raw UTF-8 output for non-ASCII text.
+    return json.dumps(payload, indent=2, sort_keys=sort_keys, ensure_ascii=False).encode("utf-8")
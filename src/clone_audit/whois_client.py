@@ -9,6 +9,7 @@ from urllib.parse import urlparse
 import requests
 
 from .models import WhoisRecord
+from .utils import encode_json
 
 try:  # pragma: no cover - optional dependency
     import whois  # type: ignore
@@ -23,6 +24,12 @@ _RDAP_HEADERS = {
 
 
 class WhoisClient:
+    def __init__(self) -> None:
+        # One pooled session so the base and clone RDAP lookups (and their registry
+        # redirects) reuse connections instead of paying a TLS handshake each.
+        self._session = requests.Session()
+        self._session.headers.update(_RDAP_HEADERS)
+
     def lookup(self, target: str) -> WhoisRecord:
         domain = self._extract_domain(target)
         if not domain:
@@ -85,7 +92,7 @@ class WhoisClient:
     def _lookup_rdap(self, domain: str) -> Optional[WhoisRecord]:
         rdap_url = f"https://rdap.org/domain/{domain}"
         try:
-            response = requests.get(rdap_url, timeout=_RDAP_TIMEOUT, headers=_RDAP_HEADERS)
+            response = self._session.get(rdap_url, timeout=_RDAP_TIMEOUT)
             response.raise_for_status()
         except requests.RequestException:
             return None
@@ -100,7 +107,7 @@ class WhoisClient:
         updated_date = self._extract_rdap_event(data, "last changed")
         expiration_date = self._extract_rdap_event(data, "expiration")
         name_servers = self._extract_rdap_nameservers(data)
-        raw_text = json.dumps(data, indent=2)
+        raw_text = encode_json(data).decode("utf-8")
 
         return WhoisRecord(
             domain=domain,
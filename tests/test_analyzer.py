@@ -1,5 +1,8 @@
+import os
+import subprocess
 import sys
 import threading
+from pathlib import Path
 from types import ModuleType, SimpleNamespace
 
 try:  # pragma: no cover - dependency shim for test environment
@@ -12,6 +15,7 @@ except ModuleNotFoundError:  # pragma: no cover - dependency shim for test envir
 
 import pytest
 
+import clone_audit
 from clone_audit.analyzer import SiteAnalyzer
 from clone_audit.config import ComparisonConfig, CrawlConfig, ExtractionConfig
 from clone_audit.models import (
@@ -50,7 +54,33 @@ def _fake_compare(base: SiteArtifacts, clone: SiteArtifacts) -> ComparisonResult
     )
 
 
-def test_run_crawls_sites_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
+def _meet(barrier: threading.Barrier, what: str) -> None:
+    try:
+        barrier.wait(timeout=1.0)
+    except threading.BrokenBarrierError as exc:  # pragma: no cover - defensive
+        pytest.fail(f"{what} were not executed in parallel: {exc}")
+
+
+@pytest.fixture
+def stub_lookups(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Answer WHOIS and hosting lookups with empty records; tests may override either."""
+    monkeypatch.setattr(
+        SiteAnalyzer,
+        "_lookup_whois",
+        lambda self, target: WhoisRecord(
+            domain=target, registrar=None, creation_date=None, updated_date=None, expiration_date=None
+        ),
+    )
+    monkeypatch.setattr(
+        SiteAnalyzer,
+        "_lookup_hosting",
+        lambda self, target: HostingRecord(
+            domain=target, ip=None, network_name=None, organization=None, country=None
+        ),
+    )
+
+
+def test_run_crawls_sites_in_parallel(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
     analyzer = _make_analyzer()
     analyzer._comparison = SimpleNamespace(compare=_fake_compare)
 
@@ -65,41 +95,11 @@ def test_run_crawls_sites_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None:
     barrier = threading.Barrier(2)
 
     def fake_crawl_site(self: SiteAnalyzer, url: str) -> CrawlResult:
-        try:
-            barrier.wait(timeout=1.0)
-        except threading.BrokenBarrierError as exc:  # pragma: no cover - defensive
-            pytest.fail(f"site crawls were not executed in parallel: {exc}")
+        _meet(barrier, "site crawls")
         return CrawlResult(root_url=url, snapshots=[])
 
     monkeypatch.setattr(SiteAnalyzer, "_crawl_site", fake_crawl_site)
 
-    def fake_lookup(self: SiteAnalyzer, target: str) -> WhoisRecord:
-        return WhoisRecord(
-            domain=target,
-            registrar=None,
-            creation_date=None,
-            updated_date=None,
-            expiration_date=None,
-            raw_text=None,
-            error=None,
-        )
-
-    monkeypatch.setattr(SiteAnalyzer, "_lookup_whois", fake_lookup)
-
-    def fake_hosting(self: SiteAnalyzer, target: str) -> HostingRecord:
-        return HostingRecord(
-            domain=target,
-            ip="203.0.113.10",
-            network_name="ExampleNet",
-            organization="Example Hosting",
-            country="US",
-            source="https://rdap.example/ip/203.0.113.10",
-            raw=None,
-            error=None,
-        )
-
-    monkeypatch.setattr(SiteAnalyzer, "_lookup_hosting", fake_hosting)
-
     result = analyzer.run(base_url, clone_url)
 
     assert result.base is artefacts[base_url]
@@ -127,10 +127,7 @@ def test_run_performs_whois_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None
     whois_barrier = threading.Barrier(2)
 
     def fake_lookup(self: SiteAnalyzer, target: str) -> WhoisRecord:
-        try:
-            whois_barrier.wait(timeout=1.0)
-        except threading.BrokenBarrierError as exc:  # pragma: no cover - defensive
-            pytest.fail(f"WHOIS lookups were not executed in parallel: {exc}")
+        _meet(whois_barrier, "WHOIS lookups")
         return WhoisRecord(
             domain=target,
             registrar=None,
@@ -146,10 +143,7 @@ def test_run_performs_whois_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None
     hosting_barrier = threading.Barrier(2)
 
     def fake_hosting(self: SiteAnalyzer, target: str) -> HostingRecord:
-        try:
-            hosting_barrier.wait(timeout=1.0)
-        except threading.BrokenBarrierError as exc:  # pragma: no cover - defensive
-            pytest.fail(f"Hosting lookups were not executed in parallel: {exc}")
+        _meet(hosting_barrier, "Hosting lookups")
         return HostingRecord(
             domain=target,
             ip="198.51.100.5",
@@ -172,3 +166,230 @@ def test_run_performs_whois_in_parallel(monkeypatch: pytest.MonkeyPatch) -> None
     assert set(result.timings.whois.keys()) == {"base", "clone"}
     assert set(result.timings.hosting.keys()) == {"base", "clone"}
     assert result.timings.total >= result.timings.compare
+
+
+def test_crawl_site_reuses_pooled_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    analyzer = _make_analyzer()
+    sessions = []
+
+    def fake_crawl(self: SiteAnalyzer, url: str, session) -> CrawlResult:
+        sessions.append(session)
+        return CrawlResult(root_url=url, snapshots=[])
+
+    monkeypatch.setattr(SiteAnalyzer, "_crawl", fake_crawl)
+
+    with analyzer:
+        analyzer._crawl_site("https://base.test")
+        analyzer._crawl_site("https://clone.test")
+
+    assert len(sessions) == 2
+    assert sessions[0] is sessions[1]
+
+
+def test_pooled_session_retries_transient_errors_without_honouring_retry_after() -> None:
+    config = CrawlConfig(base_url="https://placeholder.test", page_concurrency=32)
+    session = SiteAnalyzer._build_session(config)
+    try:
+        for prefix in ("https://", "http://"):
+            adapter = session.get_adapter(f"{prefix}example.test")
+            retry = adapter.max_retries
+            assert retry.total == 2
+            assert 503 in retry.status_forcelist and 429 in retry.status_forcelist
+            assert retry.respect_retry_after_header is False
+            assert retry.raise_on_status is False
+            assert adapter._pool_maxsize == 128
+    finally:
+        session.close()
+
+
+def test_run_extracts_in_parallel_with_lookups(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
+    analyzer = _make_analyzer()
+    analyzer._comparison = SimpleNamespace(compare=_fake_compare)
+
+    monkeypatch.setattr(SiteAnalyzer, "_crawl_site", lambda self, url: CrawlResult(root_url=url, snapshots=[]))
+
+    extract_barrier = threading.Barrier(2)
+    lookups_started = threading.Event()
+
+    def fake_extract(self: SiteAnalyzer, crawl: CrawlResult) -> SiteArtifacts:
+        try:
+            extract_barrier.wait(timeout=1.0)
+        except threading.BrokenBarrierError as exc:  # pragma: no cover - defensive
+            pytest.fail(f"extraction was not executed in parallel: {exc}")
+        if not lookups_started.wait(timeout=1.0):  # pragma: no cover - defensive
+            pytest.fail("WHOIS lookups did not overlap extraction")
+        return _make_site(crawl.root_url)
+
+    monkeypatch.setattr(SiteAnalyzer, "_extract", fake_extract)
+
+    def fake_lookup(self: SiteAnalyzer, target: str) -> WhoisRecord:
+        lookups_started.set()
+        return WhoisRecord(
+            domain=target,
+            registrar=None,
+            creation_date=None,
+            updated_date=None,
+            expiration_date=None,
+            raw_text=None,
+            error=None,
+        )
+
+    monkeypatch.setattr(SiteAnalyzer, "_lookup_whois", fake_lookup)
+
+    with analyzer:
+        result = analyzer.run("https://base.test", "https://clone.test")
+
+    assert not extract_barrier.broken
+    assert result.base.crawl.root_url == "https://base.test"
+    assert result.clone.crawl.root_url == "https://clone.test"
+    assert set(result.timings.extract.keys()) == {"base", "clone"}
+
+
+def test_run_reuses_persistent_pool_across_runs(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
+    analyzer = _make_analyzer()
+    analyzer._comparison = SimpleNamespace(compare=_fake_compare)
+    worker_names: set[str] = set()
+
+    def fake_crawl_site(self: SiteAnalyzer, url: str) -> CrawlResult:
+        worker_names.add(threading.current_thread().name)
+        return CrawlResult(root_url=url, snapshots=[])
+
+    monkeypatch.setattr(SiteAnalyzer, "_crawl_site", fake_crawl_site)
+    monkeypatch.setattr(SiteAnalyzer, "_extract", lambda self, crawl: _make_site(crawl.root_url))
+
+    with analyzer:
+        executor = analyzer._executor
+        for _ in range(3):
+            analyzer.run("https://base.test", "https://clone.test")
+        assert analyzer._executor is executor
+
+    assert worker_names
+    assert all(name.startswith("clone-audit") for name in worker_names)
+    assert len(worker_names) <= executor._max_workers
+
+
+def test_run_clears_pooled_session_cookies_between_runs(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
+    analyzer = _make_analyzer()
+    analyzer._comparison = SimpleNamespace(compare=_fake_compare)
+    seen_cookies: list[dict[str, str]] = []
+
+    def fake_crawl(self: SiteAnalyzer, url: str, session) -> CrawlResult:
+        seen_cookies.append(session.cookies.get_dict())
+        session.cookies.set("sid", url)
+        return CrawlResult(root_url=url, snapshots=[])
+
+    monkeypatch.setattr(SiteAnalyzer, "_crawl", fake_crawl)
+    monkeypatch.setattr(SiteAnalyzer, "_extract", lambda self, crawl: _make_site(crawl.root_url))
+
+    with analyzer:
+        analyzer.run("https://base.test", "https://base.test")
+        analyzer.run("https://base.test", "https://base.test")
+
+    assert seen_cookies == [{}, {}]
+
+
+def test_lookups_are_memoized_per_host() -> None:
+    calls: list[str] = []
+
+    class CountingWhois:
+        def lookup(self, target: str) -> WhoisRecord:
+            calls.append(target)
+            return WhoisRecord(
+                domain=target, registrar=None, creation_date=None, updated_date=None, expiration_date=None
+            )
+
+    class FailingHosting:
+        def lookup(self, target: str) -> HostingRecord:
+            calls.append(target)
+            return HostingRecord(
+                domain=target,
+                ip=None,
+                network_name=None,
+                organization=None,
+                country=None,
+                error="RDAP lookup failed",
+            )
+
+    analyzer = SiteAnalyzer(
+        crawl_config=CrawlConfig(base_url="https://placeholder.test"),
+        extraction_config=ExtractionConfig(),
+        comparison_config=ComparisonConfig(),
+        whois_provider=CountingWhois(),
+        hosting_provider=FailingHosting(),
+    )
+
+    with analyzer:
+        first = analyzer._lookup_whois("https://Base.test/login")
+        second = analyzer._lookup_whois("https://base.test/other")
+        assert first is second
+        assert calls == ["https://Base.test/login"]
+
+        calls.clear()
+        analyzer._lookup_hosting("https://base.test")
+        analyzer._lookup_hosting("https://base.test")
+        assert len(calls) == 2
+
+
+def test_run_compares_before_slow_lookups_finish(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
+    analyzer = _make_analyzer()
+    compared = threading.Event()
+
+    def tracking_compare(base: SiteArtifacts, clone: SiteArtifacts) -> ComparisonResult:
+        compared.set()
+        return _fake_compare(base, clone)
+
+    analyzer._comparison = SimpleNamespace(compare=tracking_compare)
+    monkeypatch.setattr(SiteAnalyzer, "_crawl_site", lambda self, url: CrawlResult(root_url=url, snapshots=[]))
+    monkeypatch.setattr(SiteAnalyzer, "_extract", lambda self, crawl: _make_site(crawl.root_url))
+
+    def slow_lookup(self: SiteAnalyzer, target: str) -> WhoisRecord:
+        if not compared.wait(timeout=1.0):  # pragma: no cover - defensive
+            pytest.fail("comparison waited on WHOIS lookups")
+        return WhoisRecord(
+            domain=target, registrar=None, creation_date=None, updated_date=None, expiration_date=None
+        )
+
+    monkeypatch.setattr(SiteAnalyzer, "_lookup_whois", slow_lookup)
+
+    with analyzer:
+        result = analyzer.run("https://base.test", "https://clone.test")
+
+    assert result.base_whois.domain == "https://base.test"
+    assert result.clone_whois.domain == "https://clone.test"
+
+
+def test_run_analyses_identical_urls_once(monkeypatch: pytest.MonkeyPatch, stub_lookups: None) -> None:
+    analyzer = _make_analyzer()
+    analyzer._comparison = SimpleNamespace(compare=_fake_compare)
+    crawled: list[str] = []
+
+    def fake_crawl_site(self: SiteAnalyzer, url: str) -> CrawlResult:
+        crawled.append(url)
+        return CrawlResult(root_url=url, snapshots=[])
+
+    monkeypatch.setattr(SiteAnalyzer, "_crawl_site", fake_crawl_site)
+    monkeypatch.setattr(SiteAnalyzer, "_extract", lambda self, crawl: _make_site(crawl.root_url))
+
+    with analyzer:
+        result = analyzer.run("https://Base.test", "https://base.test/#top")
+
+    assert crawled == ["https://Base.test"]
+    assert result.clone is result.base
+    assert result.clone_whois is result.base_whois
+    assert result.clone_hosting is result.base_hosting
+
+
+def test_importing_analyzer_defers_heavy_dependencies() -> None:
+    code = (
+        "import sys, clone_audit.analyzer; "
+        "print(','.join(m for m in ('requests', 'bs4', 'numpy') if m in sys.modules))"
+    )
+    src_root = str(Path(clone_audit.__file__).resolve().parents[1])
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": src_root},
+    )
+    assert output.stdout.strip() == ""
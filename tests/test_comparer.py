@@ -1,4 +1,7 @@
+import pytest
+
 from clone_audit.comparer import Comparer
+from clone_audit.core import comparer as comparer_module
 from clone_audit.config import ComparisonConfig
 from clone_audit.models import CrawlResult, ImageArtifact, SiteArtifacts, StructureSignature, TextArtifact
 
@@ -58,3 +61,78 @@ def test_text_similarity_deduplicates_identical_snippets():
     clone = build_site(texts=clone_texts)
     result = comparer.compare(base, clone)
     assert len(result.text_matches) == 1
+
+
+@pytest.mark.parametrize("vectorize_min_pairs", [1, 10_000])
+def test_image_similarity_picks_nearest_hash_and_prefers_larger_ties(monkeypatch, vectorize_min_pairs):
+    monkeypatch.setattr(comparer_module, "_VECTORIZE_MIN_PAIRS", vectorize_min_pairs)
+    comparer = Comparer(ComparisonConfig(image_hash_threshold=4))
+    base = build_site(images=[ImageArtifact(page_url="https://legit", url="https://legit/a.png", hash_bits="00000000000000ff", bytes_size=10, content_type="image/png")])
+    clone = build_site(
+        images=[
+            ImageArtifact(page_url="https://clone", url="https://clone/far.png", hash_bits="ffffffffffffffff", bytes_size=99, content_type="image/png"),
+            ImageArtifact(page_url="https://clone", url="https://clone/small.png", hash_bits="00000000000000fe", bytes_size=5, content_type="image/png"),
+            ImageArtifact(page_url="https://clone", url="https://clone/large.png", hash_bits="00000000000000fd", bytes_size=50, content_type="image/png"),
+            ImageArtifact(page_url="https://clone", url="https://clone/bad.png", hash_bits="not-hex", bytes_size=500, content_type="image/png"),
+        ]
+    )
+    result = comparer.compare(base, clone)
+    assert len(result.image_matches) == 1
+    assert result.image_matches[0].clone.url == "https://clone/large.png"
+    assert result.image_matches[0].hamming_distance == 1
+
+
+
+def test_text_match_found_when_shared_tokens_are_common_on_clone_side():
+    shared = "sign in to your secure account"
+    filler_texts = [f"{shared} " + " ".join(f"filler{i}x{j}" for j in range(20)) for i in range(30)]
+    clone_texts = [
+        TextArtifact(page_url="https://clone/filler", locator=f"body/div[{i}]", text=text, token_count=26)
+        for i, text in enumerate(filler_texts)
+    ]
+    clone_texts.append(TextArtifact(page_url="https://clone", locator="body/p", text=shared, token_count=6))
+    base = build_site(
+        texts=[TextArtifact(page_url="https://legit", locator="body/p", text=f"please {shared}", token_count=7)]
+    )
+    clone = build_site(texts=clone_texts)
+
+    result = Comparer(ComparisonConfig(text_threshold=0.8)).compare(base, clone)
+
+    assert [match.clone.text for match in result.text_matches] == [shared]
+
+
+def test_contained_text_scores_exactly_like_sequence_matcher():
+    import difflib
+
+    base_text = "All rights reserved Acme Corp"
+    clone_text = "All rights reserved Acme Corp 2024"
+    base = build_site(texts=[TextArtifact(page_url="https://legit", locator="footer", text=base_text, token_count=5)])
+    clone = build_site(texts=[TextArtifact(page_url="https://clone", locator="footer", text=clone_text, token_count=6)])
+
+    result = Comparer(ComparisonConfig(text_threshold=0.8)).compare(base, clone)
+
+    assert len(result.text_matches) == 1
+    assert result.text_matches[0].similarity == difflib.SequenceMatcher(None, base_text, clone_text).ratio()
+
+
+def test_sequence_matcher_is_built_once_per_clone_text(monkeypatch):
+    built = []
+
+    class CountingMatcher(comparer_module.SequenceMatcher):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            built.append(self.b)
+
+    monkeypatch.setattr(comparer_module, "SequenceMatcher", CountingMatcher)
+    base_texts = [
+        TextArtifact(page_url=f"https://legit/{i}", locator="body/p", text=f"Sign in to your secure banking portal {word}", token_count=8)
+        for i, word in enumerate(["today", "now", "here"])
+    ]
+    clone_texts = [
+        TextArtifact(page_url="https://clone", locator="body/p", text="Sign in to your secure banking portal quickly", token_count=8),
+        TextArtifact(page_url="https://clone", locator="body/div", text="Sign in to your secure online banking portal", token_count=8),
+    ]
+
+    Comparer(ComparisonConfig(text_threshold=0.5)).compare(build_site(texts=base_texts), build_site(texts=clone_texts))
+
+    assert sorted(built) == sorted({clone.text for clone in clone_texts})
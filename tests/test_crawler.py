@@ -16,6 +16,7 @@ except ModuleNotFoundError:  # pragma: no cover - dependency shim for test envir
             return []
 
     bs4_stub.BeautifulSoup = _StubSoup  # type: ignore[attr-defined]
+    bs4_stub.SoupStrainer = lambda *_args, **_kwargs: None  # type: ignore[attr-defined]
     sys.modules["bs4"] = bs4_stub
 
 import pytest
@@ -31,37 +32,55 @@ class FakeResponse:
         self.text = html
 
 
+class FakeSession:
+    def __init__(self, factory: "SessionFactory") -> None:
+        self.factory = factory
+        self.headers: dict[str, str] = {}
+        self.adapters: dict[str, object] = {}
+
+    def mount(self, prefix: str, adapter: object) -> None:
+        self.adapters[prefix] = adapter
+        with self.factory.lock:
+            self.factory.mounted.append((prefix, adapter))
+
+    def get(self, url: str, timeout: float, allow_redirects: bool):
+        factory = self.factory
+        html = factory.html_map.get(url)
+        if html is None:
+            raise AssertionError(f"Unexpected URL requested: {url}")
+        with factory.lock:
+            factory.requested.append(url)
+            factory.active += 1
+            factory.max_active = max(factory.max_active, factory.active)
+        if url in factory.rendezvous_urls:
+            # Only returns once every rendezvous URL is in flight at the same time.
+            factory.rendezvous.wait()
+        else:
+            time.sleep(factory.delay)
+        with factory.lock:
+            factory.active -= 1
+        return FakeResponse(html)
+
+    def close(self) -> None:  # pragma: no cover - compatibility
+        pass
+
+
 class SessionFactory:
-    def __init__(self, html_map: dict[str, str], delay: float = 0.01) -> None:
+    def __init__(
+        self, html_map: dict[str, str], delay: float = 0.01, rendezvous_urls: tuple[str, ...] = ()
+    ) -> None:
         self.html_map = html_map
         self.delay = delay
+        self.rendezvous_urls = frozenset(rendezvous_urls)
+        self.rendezvous = threading.Barrier(max(len(rendezvous_urls), 1), timeout=5)
         self.lock = threading.Lock()
         self.active = 0
         self.max_active = 0
+        self.mounted: list[tuple[str, object]] = []
+        self.requested: list[str] = []
 
     def __call__(self):
-        factory = self
-
-        class _Session:
-            def __init__(self) -> None:
-                self.headers: dict[str, str] = {}
-
-            def get(self, url: str, timeout: float, allow_redirects: bool):
-                html = factory.html_map.get(url)
-                if html is None:
-                    raise AssertionError(f"Unexpected URL requested: {url}")
-                with factory.lock:
-                    factory.active += 1
-                    factory.max_active = max(factory.max_active, factory.active)
-                time.sleep(factory.delay)
-                with factory.lock:
-                    factory.active -= 1
-                return FakeResponse(html)
-
-            def close(self) -> None:  # pragma: no cover - compatibility
-                pass
-
-        return _Session()
+        return FakeSession(self)
 
 
 @pytest.mark.parametrize("concurrency", [1, 3])
@@ -88,7 +107,7 @@ def test_crawler_parallel_fetches(monkeypatch: pytest.MonkeyPatch, concurrency:
             return default
 
     class FakeSoup:
-        def __init__(self, html: str, parser: str) -> None:
+        def __init__(self, html: str, parser: str, parse_only=None) -> None:
             self._links = link_map.get(html, [])
 
         def find_all(self, selector, href=False):
@@ -96,7 +115,10 @@ def test_crawler_parallel_fetches(monkeypatch: pytest.MonkeyPatch, concurrency:
                 return [FakeTag(link) for link in self._links]
             return []
 
-    factory = SessionFactory(html_map)
+    # With several workers the two child pages must be fetched together; a serial
+    # crawl keeps the sleep so any accidental overlap would still show up.
+    rendezvous = ("https://example.test/a", "https://example.test/b") if concurrency > 1 else ()
+    factory = SessionFactory(html_map, rendezvous_urls=rendezvous)
     monkeypatch.setattr("clone_audit.crawler.requests.Session", factory)
     monkeypatch.setattr("clone_audit.crawler.BeautifulSoup", FakeSoup)
 
@@ -112,6 +134,110 @@ def test_crawler_parallel_fetches(monkeypatch: pytest.MonkeyPatch, concurrency:
 
     assert len(result.snapshots) == 3
     if concurrency > 1:
+        assert not factory.rendezvous.broken
         assert factory.max_active >= 2
     else:
         assert factory.max_active == 1
+
+
+def test_parallel_crawler_survives_worker_exceptions(monkeypatch: pytest.MonkeyPatch) -> None:
+    html_map = {
+        "https://example.test/": "<a href='/a'>A</a>",
+        "https://example.test/a": "<p>A</p>",
+    }
+
+    class ExplodingSoup:
+        def __init__(self, html: str, parser: str, parse_only=None) -> None:
+            if html == "<p>A</p>":
+                raise RuntimeError("parser exploded")
+            self._html = html
+
+        def find_all(self, selector, href=False):
+            return [FakeTagHref("/a")] if self._html == "<a href='/a'>A</a>" else []
+
+    class FakeTagHref:
+        def __init__(self, href: str) -> None:
+            self._href = href
+
+        def get(self, key: str, default=None):
+            return self._href if key == "href" else default
+
+    monkeypatch.setattr("clone_audit.crawler.requests.Session", SessionFactory(html_map))
+    monkeypatch.setattr("clone_audit.crawler.BeautifulSoup", ExplodingSoup)
+
+    config = CrawlConfig(
+        base_url="https://example.test",
+        max_pages=5,
+        max_depth=1,
+        delay_seconds=0.0,
+        page_concurrency=2,
+    )
+    result = Crawler(config=config).crawl()
+
+    assert [snapshot.url for snapshot in result.snapshots] == ["https://example.test/"]
+    assert any("parser exploded" in error for error in result.errors)
+
+
+def test_parallel_workers_share_parent_adapters(monkeypatch: pytest.MonkeyPatch) -> None:
+    html_map = {
+        "https://example.test/": "",
+    }
+    factory = SessionFactory(html_map)
+    monkeypatch.setattr("clone_audit.crawler.requests.Session", factory)
+    parent = factory()
+    shared_adapter = object()
+    parent.mount("https://", shared_adapter)
+
+    config = CrawlConfig(
+        base_url="https://example.test",
+        max_pages=1,
+        max_depth=0,
+        delay_seconds=0.0,
+        page_concurrency=2,
+    )
+    Crawler(config=config, session=parent).crawl()
+
+    worker_mounts = factory.mounted[1:]
+    assert len(worker_mounts) == 2
+    assert all(adapter is shared_adapter for _prefix, adapter in worker_mounts)
+
+
+def test_parallel_crawler_fetches_each_url_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    html_map = {
+        "https://example.test/": "root",
+        "https://example.test/a": "a",
+    }
+    link_map = {
+        "root": ["/a", "/a#top", "/a", "/"],
+        "a": ["/", "/a"],
+    }
+
+    class LinkSoup:
+        def __init__(self, html: str, parser: str, parse_only=None) -> None:
+            self._links = link_map.get(html, [])
+
+        def find_all(self, selector, href=False):
+            return [_Href(link) for link in self._links]
+
+    class _Href:
+        def __init__(self, href: str) -> None:
+            self._href = href
+
+        def get(self, key: str, default=None):
+            return self._href if key == "href" else default
+
+    factory = SessionFactory(html_map)
+    monkeypatch.setattr("clone_audit.crawler.requests.Session", factory)
+    monkeypatch.setattr("clone_audit.crawler.BeautifulSoup", LinkSoup)
+
+    config = CrawlConfig(
+        base_url="https://example.test",
+        max_pages=10,
+        max_depth=3,
+        delay_seconds=0.0,
+        page_concurrency=3,
+    )
+    result = Crawler(config=config).crawl()
+
+    assert sorted(factory.requested) == ["https://example.test/", "https://example.test/a"]
+    assert len(result.snapshots) == 2
@@ -0,0 +1,434 @@
+import pytest
+import requests
+
+from clone_audit.config import ExtractionConfig
+from clone_audit.extractor import Extractor
+
+
+class FlakySession:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get(self, url: str, timeout: float, stream: bool = False):
+        self.calls += 1
+        raise requests.ConnectionError("connection reset")
+
+    def close(self) -> None:
+        return None
+
+
+class FakeResponse:
+    def __init__(self, content: bytes = b"", headers: dict | None = None) -> None:
+        self.content = content
+        self.headers = headers or {}
+        self.read_chunks = 0
+        self.closed = False
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int):
+        for start in range(0, len(self.content), chunk_size):
+            self.read_chunks += 1
+            yield self.content[start : start + chunk_size]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FixedSession:
+    def __init__(self, response: FakeResponse) -> None:
+        self.response = response
+
+    def get(self, url: str, timeout: float, stream: bool = False):
+        return self.response
+
+    def close(self) -> None:
+        return None
+
+
+def test_failed_image_fetches_are_cached_until_clear_cache(tmp_path):
+    session = FlakySession()
+    config = ExtractionConfig(image_cache_path=str(tmp_path / "images.sqlite"))
+    extractor = Extractor(config=config, session=session)
+
+    assert extractor._fetch_image_metadata("https://example.test/logo.png") == (None, None, None, None)
+    assert extractor._fetch_image_metadata("https://example.test/logo.png") == (None, None, None, None)
+    assert session.calls == 1
+    assert extractor._disk_cache.get("https://example.test/logo.png") is None
+
+    extractor.clear_cache()
+    extractor._fetch_image_metadata("https://example.test/logo.png")
+    assert session.calls == 2
+    extractor.close()
+
+
+def test_clear_cache_drops_image_entries():
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+    extractor._image_cache["https://example.test/logo.png"] = ("00ff00ff00ff00ff", 10, "image/png", None)
+
+    extractor.clear_cache()
+
+    assert extractor._image_cache == {}
+
+
+def test_structure_signature_carries_tag_set():
+    from bs4 import BeautifulSoup
+
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+    soup = BeautifulSoup("<html><body><div><p>a</p><p>b</p></div></body></html>", "html.parser")
+
+    _, _, tag_names = extractor._collect_tags(soup)
+    signature = extractor._extract_structure("https://example.test/", 0, tag_names)
+
+    assert signature.tag_sequence == ("html", "body", "div", "p", "p")
+    assert signature.tag_set == frozenset({"html", "body", "div", "p"})
+
+
+def test_image_hash_and_preview_come_from_one_decode():
+    import io
+
+    from PIL import Image
+
+    image = Image.new("RGB", (640, 480), "white")
+    for x in range(320):
+        for y in range(480):
+            image.putpixel((x, y), (0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+    hash_bits, preview = extractor._hash_and_preview(buffer.getvalue())
+
+    assert hash_bits == "0f0f0f0f0f0f0f0f"
+    with Image.open(io.BytesIO(preview)) as thumb:
+        assert thumb.size == (320, 240)
+
+
+def test_jpeg_average_hash_is_pinned_to_the_full_decode_lanczos_value():
+    import io
+
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (2400, 1800), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((300, 200, 1400, 1200), fill=(20, 40, 160))
+    draw.ellipse((1200, 900, 2200, 1700), fill=(200, 30, 30))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+    hash_bits, _ = extractor._hash_and_preview(buffer.getvalue())
+
+    # Stored and cached hashes were produced this way; a cheaper resample
+    # (BILINEAR with reducing_gap) flips a bit here and gives ff87878781c1f1fb.
+    assert hash_bits == "ff87878781f1f1fb"
+
+
+def test_image_fetch_decodes_the_body_once(monkeypatch):
+    import io
+
+    from PIL import Image
+
+    from clone_audit.core import extractor as extractor_module
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (64, 64), "red").save(buffer, format="JPEG")
+
+    response = FakeResponse(buffer.getvalue(), {"Content-Type": "image/jpeg"})
+    opened = []
+    real_open = Image.open
+
+    def counting_open(fp, *args, **kwargs):
+        opened.append(fp)
+        return real_open(fp, *args, **kwargs)
+
+    monkeypatch.setattr(extractor_module.Image, "open", counting_open)
+    extractor = Extractor(config=ExtractionConfig(), session=FixedSession(response))
+
+    hash_bits, size_bytes, content_type, preview = extractor._fetch_image_metadata("https://example.test/a.jpg")
+
+    assert len(opened) == 1
+    assert hash_bits is not None and preview is not None
+    assert size_bytes == len(response.content)
+    assert content_type == "image/jpeg"
+    assert response.closed
+
+
+def test_page_images_are_fetched_concurrently_once_per_url():
+    import threading
+
+    from bs4 import BeautifulSoup
+
+    barrier = threading.Barrier(2, timeout=5)
+    requested: list[str] = []
+
+    class BarrierSession:
+        def get(self, url: str, timeout: float, stream: bool = False):
+            requested.append(url)
+            barrier.wait()  # only returns once two fetches are in flight together
+            return FakeResponse()
+
+    extractor = Extractor(config=ExtractionConfig(image_concurrency=4), session=BarrierSession())
+    soup = BeautifulSoup(
+        '<img src="/a.png"><img src="/b.png"><img src="/a.png">',
+        "html.parser",
+    )
+
+    _, img_tags, _ = extractor._collect_tags(soup)
+    urls, _ = extractor._image_urls("https://example.test/", img_tags)
+    images = list(extractor._extract_images("https://example.test/", urls))
+
+    assert [image.url for image in images] == [
+        "https://example.test/a.png",
+        "https://example.test/b.png",
+        "https://example.test/a.png",
+    ]
+    assert sorted(requested) == ["https://example.test/a.png", "https://example.test/b.png"]
+
+
+def test_image_pool_is_reused_across_pages_and_shut_down_on_close():
+    import threading
+
+    workers: set[str] = set()
+
+    class RecordingSession(FixedSession):
+        def get(self, url: str, timeout: float, stream: bool = False):
+            workers.add(threading.current_thread().name)
+            return FakeResponse()
+
+    extractor = Extractor(config=ExtractionConfig(image_concurrency=2), session=RecordingSession(FakeResponse()))
+    pool = extractor._image_pool
+
+    for page in range(3):
+        urls = [f"https://example.test/{page}/a.png", f"https://example.test/{page}/b.png"]
+        list(extractor._extract_images(f"https://example.test/{page}", urls))
+
+    assert extractor._image_pool is pool
+    assert workers and all(name.startswith("clone-audit-img") for name in workers)
+    assert len(workers) <= 2
+    extractor.close()
+    with pytest.raises(RuntimeError):
+        pool.submit(print)
+
+
+def test_text_locators_number_same_name_siblings():
+    from bs4 import BeautifulSoup
+
+    extractor = Extractor(config=ExtractionConfig(min_text_length=1), session=FlakySession())
+    soup = BeautifulSoup(
+        "<html><body><div><p>first</p><span>x</span><p>second</p></div><div><p>third</p></div></body></html>",
+        "html.parser",
+    )
+
+    blocks, _, _ = extractor._collect_tags(soup)
+    locators = {entry.text: entry.locator for entry in extractor._extract_text("https://example.test/", blocks)}
+
+    assert locators["first"] == "[document]/html/body/div/p"
+    assert locators["second"] == "[document]/html/body/div/p[2]"
+    assert locators["third"] == "[document]/html/body/div[2]/p"
+
+
+@pytest.mark.parametrize(
+    ("parser", "locators", "tag_sequence"),
+    [
+        (
+            "html.parser",
+            {
+                "Welcome back": "[document]/div/p",
+                "Sign in cell": "[document]/div/p[2]",
+                "cell": "[document]/div/p[2]/table/tr/td",
+            },
+            ("div", "p", "p", "table", "tr", "td"),
+        ),
+        (
+            # lxml wraps the fragment in html/body and closes the <p> before <table>.
+            "lxml",
+            {
+                "Welcome back": "[document]/html/body/div/p",
+                "Sign in": "[document]/html/body/div/p[2]",
+                "cell": "[document]/html/body/div/table/tr/td",
+            },
+            ("html", "body", "div", "p", "p", "table", "tr", "td"),
+        ),
+    ],
+)
+def test_html_parser_choice_shapes_locators_and_structure(parser, locators, tag_sequence):
+    from datetime import datetime
+
+    from clone_audit.models import CrawlResult, PageSnapshot
+
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    html = "<div><p>Welcome back</p><p>Sign in<table><tr><td>cell</td></tr></table></div>"
+    snapshot = PageSnapshot(
+        url="https://example.test/",
+        depth=0,
+        status_code=200,
+        html=html,
+        content_type="text/html",
+        fetched_at=datetime(2024, 1, 1),
+    )
+    config = ExtractionConfig(min_text_length=1, collect_images=False, html_parser=parser)
+    extractor = Extractor(config=config, session=FlakySession())
+
+    artifacts = extractor.extract(CrawlResult(root_url="https://example.test/", snapshots=[snapshot]))
+
+    found = {entry.text: entry.locator for entry in artifacts.texts}
+    assert {text: found[text] for text in locators} == locators
+    assert artifacts.structures[0].tag_sequence == tag_sequence
+
+
+def test_single_tag_walk_matches_separate_find_all_passes():
+    from bs4 import BeautifulSoup
+
+    from clone_audit.utils import iter_block_candidates
+
+    html = "<html><body>" + "<div><p>t</p><img src='/i.png'><span>s</span></div>" * 300 + "</body></html>"
+    soup = BeautifulSoup(html, "html.parser")
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+
+    blocks, img_tags, tag_names = extractor._collect_tags(soup)
+
+    assert blocks == list(iter_block_candidates(soup))
+    assert img_tags == soup.find_all("img")
+    assert tag_names == [tag.name for tag in soup.find_all(True, limit=600)]
+
+
+def test_extracted_text_keeps_token_set_without_token_tuple():
+    from bs4 import BeautifulSoup
+
+    from clone_audit.comparer import Comparer
+    from clone_audit.config import ComparisonConfig
+
+    extractor = Extractor(config=ExtractionConfig(min_text_length=1), session=FlakySession())
+    soup = BeautifulSoup("<p>Welcome to our secure customer portal</p>", "html.parser")
+    blocks, _, _ = extractor._collect_tags(soup)
+    (entry,) = extractor._extract_text("https://example.test/", blocks)
+
+    assert entry.tokens == ()
+    assert entry.token_count == 6
+    assert entry.token_set == frozenset({"welcome", "to", "our", "secure", "customer", "portal"})
+
+    score, matches = Comparer(ComparisonConfig())._compare_text([entry], [entry])
+    assert score == 1.0
+    assert matches[0].similarity == 1.0
+
+
+def test_average_hash_packs_bits_row_major_most_significant_first():
+    from PIL import Image
+
+    image = Image.new("L", (8, 8), 0)
+    image.putpixel((0, 0), 255)
+    image.putpixel((7, 7), 255)
+
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+
+    assert extractor._average_hash(image) == "8000000000000001"
+
+
+def test_oversized_images_are_sized_without_downloading(monkeypatch):
+    from clone_audit.core import extractor as extractor_module
+
+    monkeypatch.setattr(extractor_module, "_MAX_IMAGE_BYTES", 1_000)
+    declared = FakeResponse(b"x" * 5_000, {"Content-Type": "image/png", "Content-Length": "5000"})
+    undeclared = FakeResponse(b"x" * 500_000, {"Content-Type": "image/png"})
+
+    declared_meta = Extractor(config=ExtractionConfig(), session=FixedSession(declared))._fetch_image_metadata(
+        "https://example.test/big.png"
+    )
+    undeclared_meta = Extractor(config=ExtractionConfig(), session=FixedSession(undeclared))._fetch_image_metadata(
+        "https://example.test/big.png"
+    )
+
+    assert declared_meta == (None, 5_000, "image/png", None)
+    assert declared.read_chunks == 0
+    assert undeclared_meta[0] is None and undeclared_meta[3] is None
+    assert undeclared.read_chunks == 1
+    assert declared.closed and undeclared.closed
+
+
+def test_structure_only_walk_stops_at_the_tag_cap(monkeypatch):
+    from bs4 import BeautifulSoup
+
+    from clone_audit.core import extractor as extractor_module
+
+    monkeypatch.setattr(extractor_module, "_MAX_STRUCTURE_TAGS", 3)
+    soup = BeautifulSoup("<html><body>" + "<p>x</p>" * 50 + "</body></html>", "html.parser")
+    visited = []
+
+    class CountingSoup:
+        @property
+        def descendants(self):
+            for node in soup.descendants:
+                visited.append(node)
+                yield node
+
+    config = ExtractionConfig(collect_text=False, collect_images=False)
+    blocks, img_tags, tag_names = Extractor(config=config, session=FlakySession())._collect_tags(CountingSoup())
+
+    assert tag_names == ["html", "body", "p"]
+    assert blocks == [] and img_tags == []
+    assert len(visited) < 10
+
+
+def test_image_disk_cache_is_reused_by_later_extractors(tmp_path):
+    import io
+
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (16, 16), "blue").save(buffer, format="PNG")
+    config = ExtractionConfig(image_cache_path=str(tmp_path / "images.sqlite"))
+
+    first = Extractor(config=config, session=FixedSession(FakeResponse(buffer.getvalue(), {"Content-Type": "image/png"})))
+    stored = first._fetch_image_metadata("https://example.test/logo.png")
+    first.clear_cache()
+    first.close()
+
+    second = Extractor(config=config, session=FlakySession())
+    assert second._fetch_image_metadata("https://example.test/logo.png") == stored
+    assert second.session.calls == 0
+    second.close()
+
+
+def test_tracking_pixels_and_svgs_are_skipped_before_fetching():
+    from bs4 import BeautifulSoup
+
+    extractor = Extractor(config=ExtractionConfig(), session=FlakySession())
+    soup = BeautifulSoup(
+        '<img src="/logo.png" width="120">'
+        '<img src="/spacer.gif" width="1" height="1">'
+        '<img src="/brand/logo.svg">'
+        '<img src="/analytics/collect.gif">'
+        '<img src="/favicon.ico">',
+        "html.parser",
+    )
+    _, img_tags, _ = extractor._collect_tags(soup)
+
+    urls, skipped = extractor._image_urls("https://example.test/", img_tags)
+
+    assert urls == ["https://example.test/logo.png", "https://example.test/favicon.ico"]
+    assert skipped == 3
+
+
+@pytest.mark.parametrize(
+    ("path", "is_tracker"),
+    [
+        ("/pixel", True),
+        ("/pixel.gif", True),
+        ("/pixel/collect.gif", True),
+        ("/t/tracking/open.png", True),
+        ("/analytics/collect.gif", True),
+        ("/pixels/hero.jpg", False),
+        ("/pixelart/logo.png", False),
+        ("/analytics-dashboard/screenshot.png", False),
+        ("/img/tracking-map.png", False),
+    ],
+)
+def test_tracker_hints_match_whole_path_segments(path, is_tracker):
+    from bs4 import BeautifulSoup
+
+    img = BeautifulSoup(f'<img src="{path}">', "html.parser").img
+
+    assert Extractor._is_noise_image(img, f"https://example.test{path}") is is_tracker
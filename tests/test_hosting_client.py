@@ -0,0 +1,80 @@
+import requests
+
+from clone_audit.hosting_client import HostingClient
+
+
+class FakeResponse:
+    def __init__(self, url: str) -> None:
+        self.url = url
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self):
+        return {"name": "EXAMPLE-NET", "country": "US"}
+
+
+class FakeSession:
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.requested: list[str] = []
+
+    def get(self, url: str, timeout: float):
+        self.requested.append(url)
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("connection reset")
+        return FakeResponse(url)
+
+
+def test_rdap_lookups_are_shared_between_domains_on_one_ip(monkeypatch):
+    client = HostingClient()
+    session = FakeSession()
+    client._session = session
+    monkeypatch.setattr(HostingClient, "_resolve_ip", staticmethod(lambda domain: "203.0.113.7"))
+
+    first = client.lookup("https://legit.example")
+    second = client.lookup("https://clone.example")
+
+    assert session.requested == ["https://rdap.org/ip/203.0.113.7"]
+    assert first.network_name == second.network_name == "EXAMPLE-NET"
+    assert (first.domain, second.domain) == ("legit.example", "clone.example")
+
+
+def test_failed_rdap_lookups_are_retried(monkeypatch):
+    client = HostingClient()
+    session = FakeSession(failures=1)
+    client._session = session
+    monkeypatch.setattr(HostingClient, "_resolve_ip", staticmethod(lambda domain: "203.0.113.7"))
+
+    assert client.lookup("https://legit.example").error == "RDAP lookup failed"
+    assert client.lookup("https://legit.example").error is None
+    assert len(session.requested) == 2
+
+
+def _entity(name, *roles):
+    return {"roles": list(roles), "vcardArray": ["vcard", [["version", {}, "text", "4.0"], ["fn", {}, "text", name]]]}
+
+
+def test_entity_name_prefers_registrant_then_earlier_roles():
+    client = HostingClient()
+    rdap = {
+        "entities": [
+            _entity("Abuse Desk", "abuse"),
+            {"roles": ["registrant"]},  # unnamed entities never win
+            _entity("Tech Team", "Technical"),
+            _entity("Other Tech", "technical"),
+        ]
+    }
+
+    assert client._select_entity_name(rdap) == "Tech Team"
+
+    rdap["entities"].append(_entity("Example Hosting Ltd", "registrant"))
+    assert client._select_entity_name(rdap) == "Example Hosting Ltd"
+
+
+def test_entity_name_falls_back_to_first_named_entity():
+    client = HostingClient()
+    rdap = {"entities": [{"roles": ["registrant"]}, _entity("Reseller", "sponsor"), _entity("Other", "noc")]}
+
+    assert client._select_entity_name(rdap) == "Reseller"
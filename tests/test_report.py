@@ -60,3 +60,173 @@ def test_report_contains_similarity_summary():
     assert "Hosting Providers" in markdown
     assert "BaseHost" in markdown
     assert "RDAP lookup failed" in markdown
+
+
+def test_build_json_bytes_round_trips_build_json():
+    import json
+
+    base_site = build_site("https://legit.example", "Secure login portal")
+    clone_site = build_site("https://clone.example", "Secure login portal")
+    comparison = Comparer(ComparisonConfig()).compare(base_site, clone_site)
+    whois = WhoisRecord(domain="legit.example", registrar=None, creation_date=None, updated_date=None, expiration_date=None)
+    analysis = SimpleNamespace(
+        base=base_site,
+        clone=clone_site,
+        comparison=comparison,
+        base_whois=whois,
+        clone_whois=whois,
+        base_hosting=None,
+        clone_hosting=None,
+    )
+    builder = ReportBuilder(ReportConfig())
+
+    assert json.loads(builder.build_json_bytes(analysis)) == json.loads(json.dumps(builder.build_json(analysis)))
+
+
+def test_pdf_image_embeds_fetch_each_asset_once():
+    import io
+
+    from fpdf import FPDF
+    from PIL import Image
+
+    from clone_audit.models import ImageArtifact
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (20, 20), "red").save(buffer, format="PNG")
+    requested = []
+
+    def fake_get(url, timeout):
+        requested.append(url)
+        return SimpleNamespace(content=buffer.getvalue(), raise_for_status=lambda: None)
+
+    artifact = ImageArtifact(
+        page_url="https://legit.example",
+        url="https://legit.example/logo.png",
+        hash_bits="0" * 16,
+        bytes_size=len(buffer.getvalue()),
+        content_type="image/png",
+    )
+    pdf = FPDF()
+    pdf.add_page()
+    builder = ReportBuilder(ReportConfig())
+    builder._http = SimpleNamespace(get=fake_get)
+
+    builder._pdf_embed_artifact_image(pdf, artifact, x=10, y=10, width=30)
+    builder._pdf_embed_artifact_image(pdf, artifact, x=50, y=10, width=30)
+
+    assert requested == ["https://legit.example/logo.png"]
+    assert len(pdf.image_cache.images) == 1
+
+
+def test_pdf_text_wraps_long_lines_to_page_width():
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=10)
+    emitted = []
+    pdf.cell = lambda w, h, text="", **kwargs: emitted.append(text)
+    text = "WHOIS " + "registrar-data " * 80 + "\n\nlast line"
+
+    ReportBuilder(ReportConfig())._pdf_text(pdf, text)
+
+    max_width = pdf.w - pdf.l_margin - pdf.r_margin
+    assert len(emitted) > 3
+    assert all(pdf.get_string_width(line) <= max_width for line in emitted)
+    # Each wrapped row is as full as possible: adding the next character would overflow.
+    wrapped = emitted[:-2]
+    assert all(pdf.get_string_width(line + nxt[0]) > max_width for line, nxt in zip(wrapped, wrapped[1:]))
+    assert "".join(wrapped) == text.splitlines()[0]
+    assert emitted[-2:] == ["", "last line"]
+
+
+def test_skip_empty_sections_omits_match_sections_without_results():
+    base_site = build_site("https://legit.example", "Secure login portal")
+    clone_site = build_site("https://clone.example", "Completely different marketing copy")
+    comparison = Comparer(ComparisonConfig()).compare(base_site, clone_site)
+    whois = WhoisRecord(domain="legit.example", registrar=None, creation_date=None, updated_date=None, expiration_date=None)
+    analysis = SimpleNamespace(
+        base=base_site,
+        clone=clone_site,
+        comparison=comparison,
+        base_whois=whois,
+        clone_whois=whois,
+        base_hosting=None,
+        clone_hosting=None,
+    )
+
+    full = ReportBuilder(ReportConfig()).build_markdown(analysis)
+    trimmed = ReportBuilder(ReportConfig(skip_empty_sections=True)).build_markdown(analysis)
+
+    assert "## Text Matches" in full
+    for heading in ("## Text Matches", "## Image Matches", "## Structural Matches"):
+        assert heading not in trimmed
+    assert "## Similarity Overview" in trimmed
+
+
+def test_pdf_prefetches_missing_previews_concurrently():
+    import threading
+
+    from clone_audit.models import ImageArtifact, ImageMatch
+
+    barrier = threading.Barrier(2, timeout=5)
+    requested = []
+
+    def fake_get(url, timeout):
+        requested.append(url)
+        barrier.wait()  # both downloads must be in flight together
+        return SimpleNamespace(content=url.encode(), raise_for_status=lambda: None)
+
+    def artifact(url):
+        return ImageArtifact(page_url=url, url=url, hash_bits="0" * 16, bytes_size=1, content_type="image/png")
+
+    match = ImageMatch(
+        base=artifact("https://legit.example/logo.png"),
+        clone=artifact("https://clone.example/logo.png"),
+        hamming_distance=0,
+        similarity=1.0,
+    )
+    builder = ReportBuilder(ReportConfig())
+    builder._http = SimpleNamespace(get=fake_get)
+
+    builder._prefetch_image_bytes([match, match])
+
+    assert sorted(requested) == ["https://clone.example/logo.png", "https://legit.example/logo.png"]
+    assert builder._resolve_image_bytes(match.base) == b"https://legit.example/logo.png"
+    assert len(requested) == 2
+
+
+def test_homepage_screenshots_are_captured_concurrently(monkeypatch):
+    import threading
+
+    from clone_audit import report
+    from clone_audit.screenshots import ScreenshotError
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fake_capture(url, **kwargs):
+        barrier.wait()  # both captures must be running together
+        if "clone" in url:
+            raise ScreenshotError("browser crashed")
+        return b"png"
+
+    monkeypatch.setattr(report, "capture_homepage", fake_capture)
+    analysis = SimpleNamespace(
+        base=build_site("https://legit.example", "Secure login portal"),
+        clone=build_site("https://clone.example", "Secure login portal"),
+    )
+
+    base_bytes, clone_bytes, errors = ReportBuilder(ReportConfig())._collect_homepage_screenshots(analysis)
+
+    assert base_bytes == b"png"
+    assert clone_bytes is None
+    assert errors == ["Clone screenshot failed: browser crashed"]
+
+
+def test_report_builder_closes_its_http_session_on_exit():
+    closed = []
+
+    with ReportBuilder(ReportConfig()) as builder:
+        builder._http = SimpleNamespace(close=lambda: closed.append(True))
+
+    assert closed == [True]
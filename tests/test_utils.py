@@ -1,3 +1,7 @@
+import json
+
+import pytest
+
 from clone_audit import utils
 
 
@@ -15,6 +19,69 @@ def test_hamming_distance_zero_for_identical_hashes():
     assert utils.hamming_distance("ffffffffffffffff", "ffffffffffffffff") == 0
 
 
+def test_hamming_distance_counts_differing_bits():
+    assert utils.hamming_distance("ffffffffffffffff", "0000000000000000") == 64
+    assert utils.hamming_distance("0f0f0f0f0f0f0f0f", "0f0f0f0f0f0f0f0e") == 1
+
+
 def test_tokenize_text_simple():
     tokens = utils.tokenize_text("Hello, Clone Auditor!")
     assert tokens == ["hello", "clone", "auditor"]
+
+
+def test_tokenize_text_ascii_fast_path_matches_unicode_path():
+    ascii_text = "Don't miss our 2024 rates: snake_case, e-mail & more!"
+    unicode_text = ascii_text + " Café"
+
+    assert utils.tokenize_text(ascii_text) == ["don't", "miss", "our", "2024", "rates", "snake_case", "e", "mail", "more"]
+    assert utils.tokenize_text(unicode_text) == utils.tokenize_text(ascii_text) + ["café"]
+
+
+def test_cached_tokens_returns_shared_tuple_for_repeated_text():
+    first = utils.cached_tokens("Terms of Service | Privacy")
+    assert first == ("terms", "of", "service", "privacy")
+    assert utils.cached_tokens("Terms of Service | Privacy") is first
+    assert utils.tokenize_text("Terms of Service | Privacy") is not utils.tokenize_text("Terms of Service | Privacy")
+
+
+def test_url_helpers_are_memoised_and_clearable():
+    utils.normalize_url.cache_clear()
+    utils.normalize_url("HTTP://Example.COM/foo#a")
+    utils.normalize_url("HTTP://Example.COM/foo#a")
+    assert utils.normalize_url.cache_info().hits == 1
+    assert utils.is_same_domain("https://EXAMPLE.com/a", "https://example.com/")
+    assert not utils.is_same_domain("https://cdn.example.com/a", "https://example.com/")
+
+
+JSON_PAYLOAD = {
+    "site": "https://café.example",
+    "scores": {"text": 1.0, "overall": 0.8125},
+    "matches": [{"snippet": "Connexion sécurisée — 日本語", "count": 3}],
+    "empty": [],
+}
+
+
+@pytest.mark.parametrize("backend", ["orjson", "stdlib"])
+def test_encode_json_writes_floats_and_raw_utf8_on_both_paths(monkeypatch, backend):
+    if backend == "orjson" and utils.orjson is None:
+        pytest.skip("orjson not installed")
+    if backend == "stdlib":
+        monkeypatch.setattr(utils, "orjson", None)
+
+    encoded = utils.encode_json(JSON_PAYLOAD)
+
+    assert "sécurisée".encode("utf-8") in encoded
+    assert "café".encode("utf-8") in encoded
+    assert b"\\u00e9" not in encoded
+    assert b'\n    "overall": 0.8125' in encoded
+    assert b'"text": 1.0' in encoded
+    assert json.loads(encoded) == JSON_PAYLOAD
+
+
+def test_encode_json_matches_between_orjson_and_stdlib(monkeypatch):
+    if utils.orjson is None:
+        pytest.skip("orjson not installed")
+    with_orjson = utils.encode_json(JSON_PAYLOAD, sort_keys=True)
+    monkeypatch.setattr(utils, "orjson", None)
+
+    assert utils.encode_json(JSON_PAYLOAD, sort_keys=True) == with_orjson